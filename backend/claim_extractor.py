@@ -1,5 +1,6 @@
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from typing import Dict, Any, List, Optional
+import asyncio
 import torch
 import numpy as np
 from PIL import Image
@@ -8,6 +9,8 @@ from io import BytesIO
 import base64
 import re
 from .claim_verifier import ClaimVerifier
+from .ocr import choose_route
+from .tracing import span, traced
 
 def query_ollama(prompt: str, model: str = "llama3.2", image: Optional[Image.Image] = None) -> str:
     """
@@ -26,20 +29,36 @@ def query_ollama(prompt: str, model: str = "llama3.2", image: Optional[Image.Ima
             img_str = base64.b64encode(buffered.getvalue()).decode()
             payload["images"] = [img_str]
         
-        response = requests.post(
-            "http://host.docker.internal:11434/api/generate", 
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json().get("response", "")
+        with span("ollama.generate", model=model, image=image is not None) as s:
+            response = requests.post(
+                "http://host.docker.internal:11434/api/generate", 
+                json=payload
+            )
+            response.raise_for_status()
+            data = response.json()
+            if s:
+                s.set_attribute("prompt_tokens", data.get("prompt_eval_count", 0))
+                s.set_attribute("completion_tokens", data.get("eval_count", 0))
+        return data.get("response", "")
     except Exception as e:
         print(f"Error querying Ollama: {str(e)}")
         return ""
 
+def load_image(image_path: str) -> Image.Image:
+    if image_path.startswith(('http://', 'https://')):
+        return Image.open(requests.get(image_path, stream=True).raw)
+    return Image.open(image_path)
+
 class ClaimExtractor:
+    """
+    Extracts claims with Ollama. The extract_* coroutines run their blocking
+    calls (HTTP, image decoding, OCR) in threads, so they can be awaited
+    directly on the event loop.
+    """
     def __init__(self):
         self.model = "llama3.2"
 
+    @traced("ClaimExtractor.extract_from_text")
     async def extract_from_text(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract claims from text content using Ollama
@@ -55,7 +74,7 @@ class ClaimExtractor:
             
             Response:"""
             
-            result = query_ollama(prompt, self.model)
+            result = await asyncio.to_thread(query_ollama, prompt, self.model)
             if not result:
                 return [{'claim': text, 'confidence': 0.5}]
 
@@ -86,12 +105,33 @@ class ClaimExtractor:
             return []
         return [f"{cleaned} is a valid claim.", f"{cleaned} is not a valid claim."]
 
+    @traced("ClaimExtractor.extract_from_image")
     async def extract_from_image(self, image_path: str) -> Dict[str, Any]:
         """
-        Extract claims from image content using Ollama
+        Extract claims from image content. Text-dominant images such as screenshots
+        are read with OCR and sent through the text extraction path; everything
+        else goes to the vision model.
         """
+        route = {"path": "vision", "reason": "not_routed"}
         try:
-            image = Image.open(requests.get(image_path, stream=True).raw) if image_path.startswith(('http://', 'https://')) else Image.open(image_path)
+            with span("image.load", remote=image_path.startswith(('http://', 'https://'))):
+                image = await asyncio.to_thread(load_image, image_path)
+
+            with span("ocr.route") as s:
+                route = await asyncio.to_thread(choose_route, image)
+                if s:
+                    s.set_attribute("path", route["path"])
+                    s.set_attribute("reason", route["reason"])
+
+            if route["path"] == "ocr":
+                ocr_text = route.pop("text")
+                text_claims = await self.extract_from_text(ocr_text)
+                return {
+                    'claims': [{'text': c['claim'], 'confidence': c['confidence']} for c in text_claims],
+                    'image_path': image_path,
+                    'ocr_text': ocr_text,
+                    'route': route
+                }
 
             prompt = """Describe what you see in this image and extract any statements that could be considered claims.
 A claim is any statement that makes an assertion about what is shown in the image.
@@ -101,7 +141,7 @@ Do not add explanations or commentary.
 
 Claims:"""
 
-            result = query_ollama(prompt, self.model, image)
+            result = await asyncio.to_thread(query_ollama, prompt, self.model, image)
             claims = []
             for line in result.split('\n'):
                 line = line.strip()
@@ -112,14 +152,16 @@ Claims:"""
 
             return {
                 'claims': [{'text': claim, 'confidence': 1.0} for claim in claims],
-                'image_path': image_path
+                'image_path': image_path,
+                'route': route
             }
 
         except Exception as e:
             return {
                 'error': str(e),
                 'claims': [],
-                'image_path': image_path
+                'image_path': image_path,
+                'route': route
             }
 
     async def extract_from_video(self, video_path: str) -> Dict[str, Any]:
@@ -1,27 +1,122 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import requests
 import json
 import wikipediaapi
 import re
 import certifi
-import ssl
+import os
+import time
+from .context_selector import CONTEXT_TOKEN_BUDGET, estimate_tokens, select_context
+from .shared_cache import SharedCache
+from .tracing import span, traced
+from .verdict_store import VerdictStore
+
+# Instruction blocks are kept free of per-claim text and placed first in the
+# prompt, so Ollama can reuse its prompt cache for the shared prefix
+CLASSIFICATION_INSTRUCTIONS = """You are a fact-checking expert specializing in scientific classification. For the claim below, you must:
+1. Determine if the claim is true or false based on:
+   - Scientific classification
+   - Botanical definitions
+   - Expert consensus
+   - Reliable sources
+2. Assign a credibility score (0-100):
+   - 100: Completely true, scientifically proven
+   - 75: Mostly true, minor classification nuances
+   - 50: Partially true, depends on context
+   - 25: Mostly false, some truth
+   - 0: Completely false
+3. Provide a clear explanation with scientific evidence
+4. List authoritative sources
+
+IMPORTANT: You must respond with a valid JSON object in this exact format:
+{
+  "credibility_score": 100,
+  "verdict": "True",
+  "explanation": "Your explanation here",
+  "sources": ["Source 1", "Source 2"]
+}
+
+Do not include any text before or after the JSON object. The response must be parseable as JSON."""
+
+GENERAL_INSTRUCTIONS = """You are a fact-checking expert. For the claim below, you must:
+1. Determine if the claim is true or false based on:
+   - Scientific consensus
+   - Historical records
+   - Expert opinions
+   - Reliable sources
+2. Assign a credibility score (0-100):
+   - 100: Completely true, well-documented
+   - 75: Mostly true, minor inaccuracies
+   - 50: Partially true, needs context
+   - 25: Mostly false, some truth
+   - 0: Completely false
+3. Provide a clear explanation with evidence
+4. List authoritative sources
+
+IMPORTANT: You must respond with a valid JSON object in this exact format:
+{
+  "credibility_score": 100,
+  "verdict": "True",
+  "explanation": "Your explanation here",
+  "sources": ["Source 1", "Source 2"]
+}
+
+Do not include any text before or after the JSON object. The response must be parseable as JSON."""
 
 class ClaimVerifier:
-    def __init__(self):
+    def __init__(self, store: Optional[VerdictStore] = None, context_budget: int = CONTEXT_TOKEN_BUDGET,
+                 model: str = "llama3.2", cache: Optional[SharedCache] = None):
+        self.store = store
+        self.cache = cache
+        self.context_budget = context_budget
+        self.model = model
         self.ollama_url = "http://host.docker.internal:11434/api/generate"
-        # Create a custom SSL context with verified certificates
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
+        # Keep the model (and its prompt cache) loaded between calls
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # Extra keyword arguments are passed to requests, so verify against certifi's CA bundle
         self.wiki = wikipediaapi.Wikipedia(
             language='en',
             extract_format=wikipediaapi.ExtractFormat.WIKI,
             user_agent='FactChecker/1.0',
-            ssl_context=ssl_context
+            verify=certifi.where()
         )
 
-    def _get_wikipedia_info(self, claim: str) -> Dict[str, Any]:
+    def _fetch_page(self, title: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Fetch a page summary and its current revision, through the shared cache when set.
+        """
+        cache_key = f"wiki:summary:{title}"
+        if self.cache and use_cache:
+            with span("cache.get", key=cache_key) as s:
+                cached = self.cache.get(cache_key)
+                if s:
+                    s.set_attribute("hit", cached is not None)
+            if cached is not None:
+                return cached
+
+        with span("wikipedia.page", title=title):
+            page = self.wiki.page(title)
+            if page.exists():
+                info = {
+                    "exists": True,
+                    "title": page.title,
+                    "summary": page.summary,
+                    "url": page.fullurl,
+                    "page_id": page.pageid,
+                    "revision": page.lastrevid
+                }
+            else:
+                info = {"exists": False, "title": title}
+
+        if self.cache:
+            self.cache.set(cache_key, info)
+        return info
+
+    def _get_wikipedia_info(self, claim: str, use_cache: bool = True, raise_errors: bool = False) -> Dict[str, Any]:
         """
         Try to extract the most relevant topic from the claim for Wikipedia lookup.
         Naive fallback: use first noun phrase or capitalized word.
+        Lookup errors yield empty evidence unless raise_errors is set.
         """
         try:
             # For questions about classification, try to extract the subject
@@ -43,146 +138,195 @@ class ClaimVerifier:
                         break
                 topic = topic or claim.split()[0]
 
-            page = self.wiki.page(topic)
-            summary = page.summary if page.exists() else ""
+            page = self._fetch_page(topic, use_cache)
+            summary = page["summary"] if page["exists"] else ""
+            pages = [self._page_revision(page)] if page["exists"] else []
 
             # Try to get family information if it's a plant
             family_info = ""
+            family_summary = ""
             if "family" in claim.lower():
                 family_match = re.search(r'(\w+)\s+family', claim.lower())
                 if family_match:
-                    family_page = self.wiki.page(family_match.group(1) + " family")
-                    if family_page.exists():
-                        family_info = f"\nFamily Information: {family_page.summary}"
+                    family_page = self._fetch_page(family_match.group(1) + " family", use_cache)
+                    if family_page["exists"]:
+                        family_summary = family_page["summary"]
+                        family_info = f"\nFamily Information: {family_summary}"
+                        pages.append(self._page_revision(family_page))
 
             return {
-                "title": page.title if page.exists() else topic,
+                "title": page["title"],
                 "summary": summary + family_info,
-                "url": page.fullurl if page.exists() else "",
-                "exists": page.exists()
+                "documents": [doc for doc in (summary, family_summary) if doc],
+                "url": page["url"] if page["exists"] else "",
+                "exists": page["exists"],
+                "pages": pages
             }
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error in _get_wikipedia_info: {str(e)}")
-            return {"exists": False, "summary": ""}
+            return {"exists": False, "summary": "", "documents": [], "pages": []}
 
-    async def verify_claim(self, claim: str) -> Dict[str, Any]:
-        try:
-            wiki_info = self._get_wikipedia_info(claim)
-            wiki_context = wiki_info.get('summary', '')
-            
-            # For classification questions, add specific guidance
-            if "is" in claim.lower() and ("a" in claim.lower() or "an" in claim.lower()):
-                prompt = f"""You are a fact-checking expert specializing in scientific classification. For the claim below, you must:
-1. Determine if the claim is true or false based on:
-   - Scientific classification
-   - Botanical definitions
-   - Expert consensus
-   - Reliable sources
-2. Assign a credibility score (0-100):
-   - 100: Completely true, scientifically proven
-   - 75: Mostly true, minor classification nuances
-   - 50: Partially true, depends on context
-   - 25: Mostly false, some truth
-   - 0: Completely false
-3. Provide a clear explanation with scientific evidence
-4. List authoritative sources
-
-Claim: "{claim}"
+    def _page_revision(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Identify the exact page revision a verdict relies on.
+        """
+        return {
+            "page_id": page["page_id"],
+            "revision": page["revision"],
+            "title": page["title"]
+        }
 
-Wikipedia Context: "{wiki_context}"
+    def lookup(self, claim: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored verdict for a claim, if any.
+        """
+        if not self.store:
+            return None
+        with span("verdict_store.get") as s:
+            stored = self.store.get(claim)
+            if s:
+                s.set_attribute("hit", stored is not None)
+        return stored
 
-IMPORTANT: You must respond with a valid JSON object in this exact format:
-{{
-  "credibility_score": 100,
-  "verdict": "True",
-  "explanation": "Your explanation here",
-  "sources": ["Source 1", "Source 2"]
-}}
+    def retrieve(self, claim: str, use_cache: bool = True, raise_errors: bool = False) -> Dict[str, Any]:
+        """
+        Fetch Wikipedia evidence for a claim and compress it to the context budget.
+        Pass use_cache=False to bypass (and overwrite) cached page summaries, and
+        raise_errors=True to tell a failed lookup apart from a missing page.
+        """
+        wiki_info = self._get_wikipedia_info(claim, use_cache, raise_errors)
+        with span("context.select", budget=self.context_budget) as s:
+            selection = select_context(claim, wiki_info.get('documents', []), self.context_budget)
+            if s:
+                s.set_attribute("tokens_saved", selection["original_tokens"] - selection["context_tokens"])
+        return {"wiki_info": wiki_info, "selection": selection}
 
-Do not include any text before or after the JSON object. The response must be parseable as JSON."""
-            else:
-                prompt = f"""You are a fact-checking expert. For the claim below, you must:
-1. Determine if the claim is true or false based on:
-   - Scientific consensus
-   - Historical records
-   - Expert opinions
-   - Reliable sources
-2. Assign a credibility score (0-100):
-   - 100: Completely true, well-documented
-   - 75: Mostly true, minor inaccuracies
-   - 50: Partially true, needs context
-   - 25: Mostly false, some truth
-   - 0: Completely false
-3. Provide a clear explanation with evidence
-4. List authoritative sources
+    def judge(self, claim: str, evidence: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ask the LLM for a verdict on the claim given retrieved evidence.
+        Raises on LLM or parsing errors.
+        """
+        wiki_info = evidence["wiki_info"]
+        selection = evidence["selection"]
 
-Claim: "{claim}"
+        # For classification questions, add specific guidance
+        if "is" in claim.lower() and ("a" in claim.lower() or "an" in claim.lower()):
+            instructions = CLASSIFICATION_INSTRUCTIONS
+        else:
+            instructions = GENERAL_INSTRUCTIONS
+        prompt = f"""{instructions}
 
-Wikipedia Context: "{wiki_context}"
+Wikipedia Context: "{selection['context']}"
 
-IMPORTANT: You must respond with a valid JSON object in this exact format:
-{{
-  "credibility_score": 100,
-  "verdict": "True",
-  "explanation": "Your explanation here",
-  "sources": ["Source 1", "Source 2"]
-}}
+Claim: "{claim}"
 
-Do not include any text before or after the JSON object. The response must be parseable as JSON."""
+JSON:"""
 
+        with span("ollama.generate", model=self.model) as s:
             response = requests.post(
                 self.ollama_url,
                 json={
-                    "model": "llama3.2",
+                    "model": self.model,
                     "prompt": prompt,
-                    "stream": False
+                    "stream": False,
+                    "keep_alive": self.keep_alive
                 }
             )
             response.raise_for_status()
-            raw = response.json().get("response", "")
-
-            if not raw:
-                raise ValueError("Empty response from Ollama")
-
-            # Clean the response to ensure it's valid JSON
-            raw = raw.strip()
-            # Remove any text before the first {
-            raw = raw[raw.find("{"):]
-            # Remove any text after the last }
-            raw = raw[:raw.rfind("}")+1]
-
-            try:
-                result = json.loads(raw)
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error: {str(e)}")
-                print(f"Raw response: {raw}")
-                raise ValueError(f"Invalid JSON in response: {str(e)}")
-
-            # Validate and set default values for required fields
-            result = {
-                "credibility_score": int(result.get("credibility_score", 0)),
-                "verdict": str(result.get("verdict", "False")),
-                "explanation": str(result.get("explanation", "No explanation provided.")),
-                "sources": list(result.get("sources", []))
-            }
+            data = response.json()
+            if s:
+                s.set_attribute("prompt_tokens", data.get("prompt_eval_count", 0))
+                s.set_attribute("completion_tokens", data.get("eval_count", 0))
+        raw = data.get("response", "")
+
+        if not raw:
+            raise ValueError("Empty response from Ollama")
 
-            # Ensure credibility score is between 0 and 100
-            result["credibility_score"] = max(0, min(100, result["credibility_score"]))
+        # Clean the response to ensure it's valid JSON
+        raw = raw.strip()
+        # Remove any text before the first {
+        raw = raw[raw.find("{"):]
+        # Remove any text after the last }
+        raw = raw[:raw.rfind("}")+1]
 
-            # Add Wikipedia as a source if available
-            if wiki_info.get("exists"):
-                result["sources"].append({
-                    "title": wiki_info["title"],
-                    "url": wiki_info["url"]
-                })
+        try:
+            result = json.loads(raw)
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {str(e)}")
+            print(f"Raw response: {raw}")
+            raise ValueError(f"Invalid JSON in response: {str(e)}")
+
+        # Validate and set default values for required fields
+        result = {
+            "credibility_score": int(result.get("credibility_score", 0)),
+            "verdict": str(result.get("verdict", "False")),
+            "explanation": str(result.get("explanation", "No explanation provided.")),
+            "sources": list(result.get("sources", []))
+        }
+
+        # Ensure credibility score is between 0 and 100
+        result["credibility_score"] = max(0, min(100, result["credibility_score"]))
+
+        result["context"] = {
+            "evidence_sentences": selection["sentences_selected"],
+            "candidate_sentences": selection["sentences_total"],
+            "prompt_tokens": data.get("prompt_eval_count", estimate_tokens(prompt)),
+            "prompt_tokens_saved": selection["original_tokens"] - selection["context_tokens"]
+        }
+
+        # Add Wikipedia as a source if available
+        if wiki_info.get("exists"):
+            result["sources"].append({
+                "title": wiki_info["title"],
+                "url": wiki_info["url"]
+            })
+        return result
+
+    def record(self, claim: str, result: Dict[str, Any], evidence: Dict[str, Any], save: bool = True) -> Dict[str, Any]:
+        """
+        Persist a fresh verdict with the revisions it relied on and stamp its freshness.
+        Verdicts without Wikipedia sources are not persisted: there is no revision
+        to re-check them against, so they could never be refreshed. With save=False
+        the verdict is only stamped, e.g. for provisional text that is still being edited.
+        """
+        pages = evidence["wiki_info"].get("pages", [])
+        if self.store and pages and save:
+            with span("verdict_store.save"):
+                self.store.save(claim, result, pages)
 
-            return result
+        verified_at = time.time()
+        result["freshness"] = {
+            "cached": False,
+            "verified_at": verified_at,
+            "revisions_checked_at": verified_at
+        }
+        return result
 
+    @staticmethod
+    def error_result(error: Exception) -> Dict[str, Any]:
+        return {
+            "credibility_score": 0,
+            "verdict": "False",
+            "explanation": f"Error during fact-checking: {str(error)}",
+            "sources": []
+        }
+
+    @traced("ClaimVerifier.verify_claim")
+    async def verify_claim(self, claim: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Verify a claim, serving a stored verdict when one exists unless refresh is set.
+        """
+        if not refresh:
+            stored = self.lookup(claim)
+            if stored:
+                return stored
+
+        try:
+            evidence = self.retrieve(claim)
+            result = self.judge(claim, evidence)
+            return self.record(claim, result, evidence)
         except Exception as e:
             print(f"Error in verify_claim: {str(e)}")
-            return {
-                "credibility_score": 0,
-                "verdict": "False",
-                "explanation": f"Error during fact-checking: {str(e)}",
-                "sources": []
-            }
+            return self.error_result(e)
@@ -0,0 +1,83 @@
+from typing import Dict, Any, List
+import math
+import os
+import re
+from .text_utils import split_sentences
+
+# Maximum number of prompt tokens spent on retrieved evidence
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "300"))
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "of", "in", "on", "at",
+    "to", "for", "and", "or", "by", "with", "as", "that", "this", "it", "its", "from",
+    "not", "no", "do", "does", "did", "has", "have", "had"
+}
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for llama-style tokenizers (about four characters per token).
+    """
+    return math.ceil(len(text) / 4) if text else 0
+
+def _terms(text: str) -> List[str]:
+    return [t for t in re.findall(r'\w+', text.lower()) if t not in STOPWORDS]
+
+def rank_sentences(claim: str, sentences: List[str], k1: float = 1.2, b: float = 0.75) -> List[float]:
+    """
+    Score each sentence against the claim with BM25, treating sentences as documents.
+    """
+    query = set(_terms(claim))
+    docs = [_terms(sentence) for sentence in sentences]
+    if not docs:
+        return []
+    avg_len = sum(len(doc) for doc in docs) / len(docs) or 1.0
+    doc_freq = {term: sum(1 for doc in docs if term in doc) for term in query}
+
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in query:
+            tf = doc.count(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+def select_context(claim: str, documents: List[str], budget: int = CONTEXT_TOKEN_BUDGET) -> Dict[str, Any]:
+    """
+    Pack the sentences most relevant to the claim into at most budget tokens,
+    keeping them in their original order. The lead sentence of each document is
+    packed first; a lead sentence longer than the remaining budget is dropped.
+    """
+    sentences = [sentence for document in documents for sentence in split_sentences(document)]
+    original_tokens = sum(estimate_tokens(document) for document in documents)
+    scores = rank_sentences(claim, sentences)
+
+    # The opening sentence of a summary usually defines the subject
+    lead_indices = set()
+    offset = 0
+    for document in documents:
+        lead_indices.add(offset)
+        offset += len(split_sentences(document))
+
+    order = sorted(lead_indices & set(range(len(sentences))))
+    order += sorted((i for i in range(len(sentences)) if i not in lead_indices and scores[i] > 0),
+                    key=lambda i: scores[i], reverse=True)
+    selected, used = [], 0
+    for i in order:
+        cost = estimate_tokens(sentences[i])
+        if used + cost > budget:
+            continue
+        selected.append(i)
+        used += cost
+
+    context = " ".join(sentences[i] for i in sorted(selected))
+    return {
+        "context": context,
+        "original_tokens": original_tokens,
+        "context_tokens": estimate_tokens(context),
+        "sentences_selected": len(selected),
+        "sentences_total": len(sentences)
+    }
@@ -4,9 +4,12 @@ import re
 import os
 import urllib3
 import certifi
+from .shared_cache import SharedCache
+from .tracing import span, traced
 
 class CredibilityChecker:
-    def __init__(self):
+    def __init__(self, cache: Optional[SharedCache] = None):
+        self.cache = cache
         self.wikipedia_api_url = "https://en.wikipedia.org/w/api.php"
         self.session = requests.Session()
         
@@ -38,6 +41,18 @@ class CredibilityChecker:
         
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
+    def _api_get(self, params: Dict[str, Any]) -> requests.Response:
+        with span("wikipedia.api", action=params.get('action'), prop=params.get('prop', params.get('list'))):
+            return self.session.get(self.wikipedia_api_url, params=params)
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        with span("cache.get", key=key) as s:
+            value = self.cache.get(key)
+            if s:
+                s.set_attribute("hit", value is not None)
+            return value
+
+    @traced("CredibilityChecker.check_claim")
     async def check_claim(self, claim: str) -> Dict[str, Any]:
         search_results = await self._search_wikipedia(claim)
         matches = []
@@ -62,8 +77,13 @@ class CredibilityChecker:
             'format': 'json',
             'srlimit': 5
         }
+        cache_key = f"wiki:search:{query}"
+        if self.cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            response = self.session.get(self.wikipedia_api_url, params=params)
+            response = self._api_get(params)
             response.raise_for_status()
             data = response.json()
             results = []
@@ -72,6 +92,8 @@ class CredibilityChecker:
                     'title': item['title'],
                     'snippet': item['snippet']
                 })
+            if self.cache:
+                self.cache.set(cache_key, results)
             return results
         except Exception as e:
             print(f"Error searching Wikipedia: {str(e)}")
@@ -86,24 +108,60 @@ class CredibilityChecker:
             'exintro': True,
             'inprop': 'url'
         }
+        cache_key = f"wiki:page:{title}"
+        if self.cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            response = self.session.get(self.wikipedia_api_url, params=params)
+            response = self._api_get(params)
             response.raise_for_status()
             data = response.json()
             pages = data['query']['pages']
             page_id = list(pages.keys())[0]
             page = pages[page_id]
             extract = re.sub(r'<[^>]+>', '', page.get('extract', ''))
-            return {
+            info = {
                 'title': page['title'],
                 'url': page['fullurl'],
                 'extract': extract,
-                'last_modified': page.get('touched', '')
+                'last_modified': page.get('touched', ''),
+                'page_id': page.get('pageid'),
+                'revision': page.get('lastrevid')
             }
+            if self.cache:
+                self.cache.set(cache_key, info)
+            return info
         except Exception as e:
             print(f"Error getting page info: {str(e)}")
             return None
     
+    def get_latest_revisions(self, page_ids: List[int], batch_size: int = 50) -> Dict[int, Optional[int]]:
+        """
+        Look up the current revision of each page, batching page IDs per request.
+        Pages that no longer exist map to None; pages whose batch failed are left out.
+        Blocks on HTTP, so call it from a worker thread when on the event loop.
+        """
+        revisions = {}
+        for start in range(0, len(page_ids), batch_size):
+            batch = page_ids[start:start + batch_size]
+            params = {
+                'action': 'query',
+                'prop': 'info',
+                'pageids': '|'.join(str(page_id) for page_id in batch),
+                'format': 'json'
+            }
+            try:
+                response = self._api_get(params)
+                response.raise_for_status()
+                pages = response.json()['query']['pages']
+                for page_id in batch:
+                    page = pages.get(str(page_id), {})
+                    revisions[page_id] = None if 'missing' in page else page.get('lastrevid')
+            except Exception as e:
+                print(f"Error getting page revisions: {str(e)}")
+        return revisions
+
     def _calculate_score(self, matches: List[Dict[str, Any]], claim: str) -> int:
         if not matches:
             return 0
@@ -1,22 +1,32 @@
 # credibility_scorer.py
 
 from typing import Dict, Any, List
-from transformers import pipeline
-from credibility_checker import CredibilityChecker
+import numpy as np
+from .credibility_checker import CredibilityChecker
+from .model_registry import get_model
+from .tracing import span
 
 class CredibilityScorer:
     def __init__(self):
-        self.similarity_model = pipeline("sentence-similarity", model="sentence-transformers/all-MiniLM-L6-v2")
+        self.similarity_model = get_model("minilm")
         self.checker = CredibilityChecker()
 
+    def _embed(self, text: str) -> np.ndarray:
+        # Mean-pool the token embeddings into one sentence vector
+        with span("model.minilm"):
+            tokens = np.array(self.similarity_model(text, truncation=True)[0])
+        vector = tokens.mean(axis=0)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
     async def score_claim(self, claim: str) -> Dict[str, Any]:
         wikipedia_result = await self.checker.check_claim(claim)
 
         similarity_scores = []
+        claim_vector = self._embed(claim)
         for match in wikipedia_result['matches']:
             try:
-                sim = self.similarity_model(claim, match['extract'])[0]['score']
-                similarity_scores.append(sim)
+                sim = float(np.dot(claim_vector, self._embed(match['extract'])))
+                similarity_scores.append(max(0.0, sim))
             except:
                 continue
 
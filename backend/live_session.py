@@ -0,0 +1,119 @@
+import asyncio
+import difflib
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, List
+from .text_utils import split_sentences
+
+def complete_sentences(text: str) -> List[str]:
+    """
+    Sentences that end in terminal punctuation, optionally followed by closing
+    quotes or brackets. Fragments still being typed are left out.
+    """
+    return [sentence for sentence in split_sentences(text) if re.search(r'[.!?]["\')\]]*$', sentence)]
+
+def parse_update(raw: str) -> str:
+    """
+    Return the document text from a client message of the form {"text": ...}.
+    Raises ValueError for anything else.
+    """
+    try:
+        message = json.loads(raw)
+    except ValueError:
+        raise ValueError("Message is not valid JSON")
+    if not isinstance(message, dict):
+        raise ValueError('Message must be a JSON object like {"text": "..."}')
+    text = message.get("text", "")
+    if not isinstance(text, str):
+        raise ValueError('"text" must be a string')
+    return text
+
+class LiveCheckSession:
+    """
+    Per-connection state for incremental checking of a document that is being edited.
+    Each revision is diffed against the previous one at sentence level and only
+    new complete sentences are checked. check runs one sentence through
+    extraction and verification.
+
+    A new sentence waits debounce seconds before its check starts, so sentences
+    that are edited away while the user is still typing never reach the models.
+    Cancelling a check that has started drops its remaining pipeline stages;
+    the stage already running in a worker thread cannot be interrupted and its
+    result is discarded.
+    """
+    def __init__(self, check: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+                 send: Callable[[Dict[str, Any]], Awaitable[None]], max_concurrency: int = 2,
+                 debounce: float = 0.5):
+        self.check = check
+        self.debounce = debounce
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.revision = 0
+        self.sentences: List[str] = []
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self._send(message)
+
+    async def update(self, text: str) -> Dict[str, Any]:
+        """
+        Apply a new revision of the document and push the sentence-level delta.
+        """
+        self.revision += 1
+        new_sentences = complete_sentences(text)
+        matcher = difflib.SequenceMatcher(a=self.sentences, b=new_sentences, autojunk=False)
+        added, removed = [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag in ('replace', 'delete'):
+                removed.extend(self.sentences[i1:i2])
+            if tag in ('replace', 'insert'):
+                added.extend({'index': j, 'sentence': new_sentences[j]} for j in range(j1, j2))
+        self.sentences = new_sentences
+
+        present = set(new_sentences)
+        removed = [sentence for sentence in dict.fromkeys(removed) if sentence not in present]
+        for sentence in removed:
+            self.results.pop(sentence, None)
+            task = self.tasks.pop(sentence, None)
+            if task:
+                task.cancel()
+
+        delta = {
+            'type': 'delta',
+            'revision': self.revision,
+            'added': added,
+            'removed': removed
+        }
+        await self.send(delta)
+
+        for item in added:
+            sentence = item['sentence']
+            if sentence in self.results:
+                await self.send({'type': 'result', 'sentence': sentence, 'claims': self.results[sentence]})
+            elif sentence not in self.tasks:
+                self.tasks[sentence] = asyncio.create_task(self._check(sentence))
+        return delta
+
+    async def _check(self, sentence: str) -> None:
+        try:
+            await asyncio.sleep(self.debounce)
+            async with self._semaphore:
+                verified = await self.check(sentence)
+            self.results[sentence] = verified
+            await self.send({'type': 'result', 'sentence': sentence, 'claims': verified})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error checking sentence: {str(e)}")
+            await self.send({'type': 'error', 'sentence': sentence, 'error': str(e)})
+        finally:
+            if self.tasks.get(sentence) is asyncio.current_task():
+                del self.tasks[sentence]
+
+    def close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
@@ -1,10 +1,22 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect, Request, Header
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any, List, Optional
+import asyncio
+import hmac
+import os
 import uvicorn
 from backend.claim_extractor import ClaimExtractor
 from backend.claim_verifier import ClaimVerifier
+from backend.credibility_checker import CredibilityChecker
+from backend.live_session import LiveCheckSession, parse_update
 from backend.media_processor import MediaProcessor
+from backend.model_registry import preload_models
+from backend.pipeline import Pipeline
+from backend.shared_cache import SharedCache
+from backend.tracing import SamplingProfiler, request_trace, save_profile, load_profile
+from backend.verdict_refresher import VerdictRefresher
+from backend.verdict_store import VerdictStore
 
 app = FastAPI(
     title="Fact Checker API",
@@ -21,51 +33,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def is_admin(token: Optional[str]) -> bool:
+    admin_token = os.getenv("ADMIN_TOKEN", "")
+    return bool(admin_token and token and hmac.compare_digest(token, admin_token))
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Trace every request. Admins can send "X-Profile: <ADMIN_TOKEN>" to also run
+    the sampling profiler; the profile is fetched from /admin/profiles/{trace_id}.
+    """
+    profiler = SamplingProfiler() if is_admin(request.headers.get("x-profile")) else None
+    with request_trace(f"{request.method} {request.url.path}", path=request.url.path) as trace:
+        if profiler:
+            profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            if profiler:
+                save_profile(trace.trace_id, profiler.stop())
+    response.headers["X-Trace-Id"] = trace.trace_id
+    if profiler:
+        response.headers["X-Profile-Id"] = trace.trace_id
+    return response
+
+@app.get("/admin/profiles/{trace_id}", response_class=PlainTextResponse)
+async def get_profile(trace_id: str, x_admin_token: Optional[str] = Header(None)):
+    """
+    Return a collapsed-stack profile, ready for flamegraph.pl or speedscope.
+    """
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    profile = load_profile(trace_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
 # Initialize components
+verdict_store = VerdictStore()
+shared_cache = SharedCache()
 claim_extractor = ClaimExtractor()
-claim_verifier = ClaimVerifier()
+claim_verifier = ClaimVerifier(store=verdict_store, cache=shared_cache)
 media_processor = MediaProcessor()
+pipeline = Pipeline(claim_extractor, claim_verifier)
+verdict_refresher = VerdictRefresher(verdict_store, claim_verifier, CredibilityChecker(cache=shared_cache))
+
+background_tasks: List[asyncio.Task] = []
+
+async def purge_cache_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await asyncio.to_thread(shared_cache.purge_expired)
+            print(f"Purged {removed} expired cache entries")
+        except Exception as e:
+            print(f"Error purging cache: {str(e)}")
+
+@app.on_event("startup")
+async def preload_configured_models():
+    # No-op under the pre-fork server, which loads them before forking
+    names = [name.strip() for name in os.getenv("PRELOAD_MODELS", "").split(",") if name.strip()]
+    preload_models(names)
+
+@app.on_event("startup")
+async def start_verdict_refresher():
+    interval = float(os.getenv("VERDICT_REFRESH_INTERVAL", "3600"))
+    if interval > 0:
+        background_tasks.append(asyncio.create_task(verdict_refresher.run(interval)))
+
+@app.on_event("startup")
+async def start_cache_purge():
+    interval = float(os.getenv("CACHE_PURGE_INTERVAL", "3600"))
+    if interval > 0:
+        background_tasks.append(asyncio.create_task(purge_cache_periodically(interval)))
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    pipeline.close()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Fact Checker API"}
 
+# Flows composed from the pipeline stages
+check_document = pipeline.flow("ingest", "preprocess", "extract", "retrieve", "verify", "score")
+extract_document = pipeline.flow("ingest", "extract")
+check_claims = pipeline.flow("retrieve", "verify", "score")
+
 @app.post("/extract-text-claims")
 async def extract_text_claims(text: str = Form(...)) -> Dict[str, Any]:
     try:
-        # Extract claims
-        claims_data = await claim_extractor.extract_from_text(text)
-        
-        if not claims_data:
+        job = await check_document({"kind": "text", "text": text})
+        if not job["claims"]:
             return {
                 "claims": [],
                 "error": "No claims could be extracted from the text"
             }
-        
-        # Verify each claim
-        verified_claims = []
-        for claim_data in claims_data:
-            try:
-                verification = await claim_verifier.verify_claim(claim_data["claim"])
-                verified_claims.append({
-                    "claim": claim_data["claim"],
-                    "confidence": claim_data["confidence"],
-                    "verification": verification
-                })
-            except Exception as e:
-                print(f"Error verifying claim: {str(e)}")
-                verified_claims.append({
-                    "claim": claim_data["claim"],
-                    "confidence": claim_data["confidence"],
-                    "verification": {
-                        "credibility_score": 0,
-                        "verdict": "Error",
-                        "explanation": f"Error during verification: {str(e)}",
-                        "sources": []
-                    }
-                })
-        
-        return {"claims": verified_claims}
+        return {"claims": job["claims"]}
     
     except Exception as e:
         print(f"Error in extract_text_claims: {str(e)}")
@@ -77,39 +144,15 @@ async def extract_text_claims(text: str = Form(...)) -> Dict[str, Any]:
 @app.post("/extract-image-claims")
 async def extract_image_claims(image: UploadFile = File(...)) -> Dict[str, Any]:
     try:
-        # Extract claims from image
-        claims = await claim_extractor.extract_from_image(image)
-        
-        if not claims:
+        job = await check_document({"kind": "image", "upload": image})
+        meta = job.get("meta", {})
+        if not job["claims"]:
             return {
                 "claims": [],
-                "error": "No claims could be extracted from the image"
+                "error": meta.get("error", "No claims could be extracted from the image"),
+                "route": meta.get("route")
             }
-        
-        # Verify each claim
-        verified_claims = []
-        for claim in claims:
-            try:
-                verification = await claim_verifier.verify_claim(claim["claim"])
-                verified_claims.append({
-                    "claim": claim["claim"],
-                    "confidence": claim["confidence"],
-                    "verification": verification
-                })
-            except Exception as e:
-                print(f"Error verifying claim: {str(e)}")
-                verified_claims.append({
-                    "claim": claim["claim"],
-                    "confidence": claim["confidence"],
-                    "verification": {
-                        "credibility_score": 0,
-                        "verdict": "Error",
-                        "explanation": f"Error during verification: {str(e)}",
-                        "sources": []
-                    }
-                })
-        
-        return {"claims": verified_claims}
+        return {"claims": job["claims"], "route": meta.get("route")}
     
     except Exception as e:
         print(f"Error in extract_image_claims: {str(e)}")
@@ -123,94 +166,84 @@ async def extract_video_claims(video: UploadFile = File(...)):
     """
     Extract claims from video content
     """
-    # Save the uploaded video temporarily
-    video_path = f"temp_{video.filename}"
-    with open(video_path, "wb") as buffer:
-        content = await video.read()
-        buffer.write(content)
-    
-    try:
-        claims = await claim_extractor.extract_from_video(video_path)
-        return claims
-    finally:
-        # Clean up temporary file
-        import os
-        if os.path.exists(video_path):
-            os.remove(video_path)
+    job = await extract_document({"kind": "video", "upload": video})
+    return {"claims": job["claims"], **job.get("meta", {})}
 
 @app.post("/api/claims/verify")
 async def verify_claims(claims: List[Dict[str, Any]]):
     """
     Verify a list of claims and return their credibility scores
     """
-    results = []
-    for claim in claims:
-        verification = await claim_verifier.verify_claim(claim["text"])
-        results.append({
-            "claim": claim["text"],
-            "verification": verification
-        })
-    return results
+    job = await check_claims({
+        "kind": "claims",
+        "claims": [{"claim": claim["text"], "confidence": claim.get("confidence", 1.0)} for claim in claims]
+    })
+    return job["claims"]
 
 @app.post("/api/analyze/text")
 async def analyze_text(text: str = Form(...)):
     """
     Analyze text content and return extracted claims with verification
     """
-    # Extract claims
-    claims_data = await claim_extractor.extract_from_text(text)
-    claims = claims_data.get("claims", [])
-    
-    # Verify each claim
-    verified_claims = []
-    for claim in claims:
-        verification = await claim_verifier.verify_claim(claim["text"])
-        verified_claims.append({
-            "claim": claim["text"],
-            "confidence": claim["confidence"],
-            "verification": verification
-        })
-    
+    job = await check_document({"kind": "text", "text": text})
     return {
-        "claims": verified_claims,
+        "claims": job["claims"],
         "original_text": text
     }
 
+@app.post("/api/analyze/batch")
+async def analyze_batch(texts: List[str]):
+    """
+    Analyze several texts at once; each runs through the pipeline concurrently
+    """
+    jobs = await asyncio.gather(*(check_document({"kind": "text", "text": text}) for text in texts))
+    return [
+        {"claims": job["claims"], "original_text": text}
+        for text, job in zip(texts, jobs)
+    ]
+
 @app.post("/api/analyze/image")
 async def analyze_image(image: UploadFile = File(...)):
     """
     Analyze image content and return extracted claims with verification
     """
-    # Save the uploaded image temporarily
-    image_path = f"temp_{image.filename}"
-    with open(image_path, "wb") as buffer:
-        content = await image.read()
-        buffer.write(content)
-    
+    job = await check_document({"kind": "image", "upload": image})
+    return {
+        "claims": job["claims"],
+        "image_path": job["path"],
+        "route": job.get("meta", {}).get("route")
+    }
+
+async def check_sentence(sentence: str) -> List[Dict[str, Any]]:
+    # The HTTP middleware does not see WebSocket traffic, so trace each check here
+    with request_trace("WS /ws/analyze/text", path="/ws/analyze/text", chars=len(sentence)):
+        # Live edits are provisional, so their verdicts are not stored
+        job = await check_document({"kind": "text", "text": sentence, "record": False})
+    return job["claims"]
+
+@app.websocket("/ws/analyze/text")
+async def analyze_text_live(websocket: WebSocket):
+    """
+    Incrementally check a document as it is edited. The client sends
+    {"text": ...} after each edit; the server pushes sentence-level deltas
+    and the results for newly added sentences as they become available.
+    Malformed messages get an error reply and the session stays open.
+    """
+    await websocket.accept()
+    session = LiveCheckSession(check_sentence, websocket.send_json)
     try:
-        # Extract claims
-        claims_data = await claim_extractor.extract_from_image(image_path)
-        claims = claims_data.get("claims", [])
-        
-        # Verify each claim
-        verified_claims = []
-        for claim in claims:
-            verification = await claim_verifier.verify_claim(claim["text"])
-            verified_claims.append({
-                "claim": claim["text"],
-                "confidence": claim["confidence"],
-                "verification": verification
-            })
-        
-        return {
-            "claims": verified_claims,
-            "image_path": image_path
-        }
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                text = parse_update(raw)
+            except ValueError as e:
+                await session.send({"type": "error", "error": str(e)})
+                continue
+            await session.update(text)
+    except WebSocketDisconnect:
+        pass
     finally:
-        # Clean up temporary file
-        import os
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        session.close()
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
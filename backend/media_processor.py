@@ -3,6 +3,7 @@ import requests
 from PIL import Image
 import base64
 from io import BytesIO
+from .tracing import span
 
 class MediaProcessor:
     def __init__(self):
@@ -37,8 +38,9 @@ class MediaProcessor:
                 "stream": False
             }
             
-            response = requests.post(self.ollama_url, json=payload)
-            response.raise_for_status()
+            with span("ollama.generate", model=self.model, image=True):
+                response = requests.post(self.ollama_url, json=payload)
+                response.raise_for_status()
             
             return {
                 "description": response.json().get("response", ""),
@@ -0,0 +1,44 @@
+from typing import Any, Callable, Dict, List
+import threading
+from .tracing import span
+
+# Loaders for every model the backend can use, keyed by short name
+_loaders: Dict[str, Callable[[], Any]] = {}
+_models: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+def register_model(name: str, loader: Callable[[], Any]) -> None:
+    """
+    Register a loader so the model can be fetched or preloaded by name.
+    """
+    _loaders[name] = loader
+
+def get_model(name: str) -> Any:
+    """
+    Return a loaded model, loading it on first use. Models loaded in the
+    parent process before forking are shared copy-on-write with workers.
+    """
+    if name not in _models:
+        with _lock:
+            if name not in _models:
+                with span("model.load", model=name):
+                    _models[name] = _loaders[name]()
+    return _models[name]
+
+def preload_models(names: List[str]) -> None:
+    """
+    Load the named models up front, e.g. before forking worker processes.
+    """
+    for name in names:
+        print(f"Preloading model: {name}")
+        get_model(name)
+
+def available_models() -> List[str]:
+    return sorted(_loaders.keys())
+
+def _load_minilm():
+    from transformers import pipeline
+    return pipeline("feature-extraction", model="sentence-transformers/all-MiniLM-L6-v2")
+
+# Sentence embeddings used by CredibilityScorer
+register_model("minilm", _load_minilm)
@@ -0,0 +1,72 @@
+from typing import Dict, Any
+import os
+from PIL import Image
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Thresholds for treating an image as text-dominant (screenshots of posts, headlines)
+OCR_MIN_WORDS = int(os.getenv("OCR_MIN_WORDS", "8"))
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "70"))
+OCR_MIN_TEXT_COVERAGE = float(os.getenv("OCR_MIN_TEXT_COVERAGE", "0.05"))
+
+def ocr_available() -> bool:
+    return pytesseract is not None
+
+def run_ocr(image: Image.Image) -> Dict[str, Any]:
+    """
+    Recognize printed text with Tesseract and report how much of the image it covers.
+    """
+    gray = image.convert("L")
+    # Tesseract is much more accurate on text that is at least ~20px high
+    if gray.width < 1000:
+        scale = 2
+        gray = gray.resize((gray.width * scale, gray.height * scale), Image.LANCZOS)
+
+    data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+    words, confidences, lines = [], [], {}
+    text_area = 0
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        confidence = float(data["conf"][i])
+        if not word or confidence < 0:
+            continue
+        words.append(word)
+        confidences.append(confidence)
+        text_area += data["width"][i] * data["height"][i]
+        line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(line_key, []).append(word)
+
+    return {
+        "text": "\n".join(" ".join(line) for line in lines.values()),
+        "word_count": len(words),
+        "confidence": sum(confidences) / len(confidences) if confidences else 0.0,
+        "text_coverage": text_area / float(gray.width * gray.height)
+    }
+
+def choose_route(image: Image.Image) -> Dict[str, Any]:
+    """
+    Decide whether an image is text-dominant enough to skip the vision model.
+    Returns the routing decision along with the OCR text when it applies.
+    """
+    if not ocr_available():
+        return {"path": "vision", "reason": "ocr_unavailable"}
+
+    try:
+        ocr = run_ocr(image)
+    except Exception as e:
+        print(f"Error running OCR: {str(e)}")
+        return {"path": "vision", "reason": "ocr_failed"}
+
+    route = {
+        "ocr_confidence": round(ocr["confidence"], 1),
+        "word_count": ocr["word_count"],
+        "text_coverage": round(ocr["text_coverage"], 3)
+    }
+    if ocr["word_count"] < OCR_MIN_WORDS or ocr["text_coverage"] < OCR_MIN_TEXT_COVERAGE:
+        return {"path": "vision", "reason": "not_text_dominant", **route}
+    if ocr["confidence"] < OCR_MIN_CONFIDENCE:
+        return {"path": "vision", "reason": "low_ocr_confidence", **route}
+    return {"path": "ocr", "reason": "text_dominant", "text": ocr["text"], **route}
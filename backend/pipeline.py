@@ -0,0 +1,275 @@
+"""
+Staged pipeline engine.
+
+Every endpoint is a composition of the stages below. A job (one document) flows
+through the document stages; the claims it yields then flow independently
+through the claim stages.
+
+    ingest -> preprocess -> extract -> [retrieve -> verify -> score] per claim
+
+Each stage has its own bounded queue and a fixed number of workers, so a slow
+stage (LLM calls) only limits itself and different requests overlap across
+stages instead of running in lockstep. Concurrency per stage can be tuned with
+PIPELINE_<STAGE>_CONCURRENCY, e.g. PIPELINE_VERIFY_CONCURRENCY=4.
+"""
+import asyncio
+import contextvars
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from .tracing import span
+
+DEFAULT_CONCURRENCY = {
+    "ingest": 8,
+    "preprocess": 8,
+    "extract": 2,
+    "retrieve": 4,
+    "verify": 2,
+    "score": 8
+}
+
+DOCUMENT_STAGES = ("ingest", "preprocess", "extract")
+CLAIM_STAGES = ("retrieve", "verify", "score")
+
+class Stage:
+    """
+    A named processing step with its own queue and worker pool. Blocking
+    functions run in a thread pool owned by the stage, sized to its
+    concurrency, so they do not stall the event loop or compete with other
+    stages for the loop's default executor.
+    """
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], concurrency: int = 1,
+                 blocking: bool = False, per_claim: bool = False, queue_size: int = 100):
+        self.name = name
+        self.func = func
+        self.concurrency = concurrency
+        self.blocking = blocking
+        self.per_claim = per_claim
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        """
+        Start the queue and workers on the running loop. They belong to one
+        event loop, so a stage first used on another loop (a restarted server,
+        a new test client) is restarted instead of waiting on dead workers.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._stop_workers()
+            self._loop = loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            if self.blocking and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                    thread_name_prefix=f"stage-{self.name}")
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def submit(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue an item and wait for this stage's result. Cancelling the caller
+        drops the item if no worker has picked it up yet.
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        # Run the work in the submitter's context so tracing spans stay attached to its request
+        await self._queue.put((item, future, contextvars.copy_context(), time.perf_counter()))
+        return await future
+
+    async def _worker(self) -> None:
+        while True:
+            item, future, context, queued_at = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                wait_ms = round((time.perf_counter() - queued_at) * 1000, 3)
+                if self.blocking:
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, context.run, self._run_sync, item, wait_ms
+                    )
+                else:
+                    result = await asyncio.create_task(self._run_async(item, wait_ms), context=context)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _run_sync(self, item: Dict[str, Any], wait_ms: float) -> Any:
+        with span(f"stage.{self.name}", queue_wait_ms=wait_ms):
+            return self.func(item)
+
+    async def _run_async(self, item: Dict[str, Any], wait_ms: float) -> Any:
+        with span(f"stage.{self.name}", queue_wait_ms=wait_ms):
+            return await self.func(item)
+
+    def _stop_workers(self) -> None:
+        for worker in self._workers:
+            # Tasks of a loop that has already been closed cannot be cancelled, nor need to be
+            if not worker.get_loop().is_closed():
+                worker.cancel()
+        self._workers = []
+        self._queue = None
+        self._loop = None
+
+    def close(self) -> None:
+        self._stop_workers()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+class Pipeline:
+    """
+    The fact-checking stages wired to the extractor and verifier.
+    """
+    def __init__(self, extractor, verifier, concurrency: Optional[Dict[str, int]] = None):
+        self.extractor = extractor
+        self.verifier = verifier
+        limits = dict(DEFAULT_CONCURRENCY)
+        for name in limits:
+            limits[name] = int(os.getenv(f"PIPELINE_{name.upper()}_CONCURRENCY", limits[name]))
+        limits.update(concurrency or {})
+
+        self.stages: Dict[str, Stage] = {
+            "ingest": Stage("ingest", self._ingest, limits["ingest"]),
+            "preprocess": Stage("preprocess", self._preprocess, limits["preprocess"], blocking=True),
+            "extract": Stage("extract", self._extract, limits["extract"]),
+            "retrieve": Stage("retrieve", self._retrieve, limits["retrieve"], blocking=True, per_claim=True),
+            "verify": Stage("verify", self._verify, limits["verify"], blocking=True, per_claim=True),
+            "score": Stage("score", self._score, limits["score"], blocking=True, per_claim=True)
+        }
+
+    def flow(self, *names: str) -> Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]:
+        """
+        Compose stages into a runnable flow. Consecutive claim stages are run
+        per claim, with the claims of one job processed concurrently.
+        """
+        unknown = [name for name in names if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {unknown}")
+
+        groups: List[List[Stage]] = []
+        for name in names:
+            stage = self.stages[name]
+            if stage.per_claim and groups and groups[-1][0].per_claim:
+                groups[-1].append(stage)
+            else:
+                groups.append([stage])
+
+        async def run(job: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                for group in groups:
+                    if group[0].per_claim:
+                        # Jobs sent with "record": False get verdicts that are not stored
+                        record = job.get("record", True)
+                        job["claims"] = list(await asyncio.gather(
+                            *(self._run_claim(group, dict(claim, record=record)) for claim in job.get("claims", []))
+                        ))
+                    else:
+                        job = await group[0].submit(job)
+                return job
+            finally:
+                temp_path = job.get("temp_path")
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return run
+
+    async def _run_claim(self, stages: List[Stage], claim: Dict[str, Any]) -> Dict[str, Any]:
+        for stage in stages:
+            claim = await stage.submit(claim)
+        return claim
+
+    def close(self) -> None:
+        for stage in self.stages.values():
+            stage.close()
+
+    # Document stages
+
+    async def _ingest(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist uploads to a temporary file so later stages work from a path.
+        """
+        upload = job.pop("upload", None)
+        if upload is not None:
+            suffix = os.path.splitext(upload.filename or "")[1]
+            content = await upload.read()
+            with tempfile.NamedTemporaryFile(prefix="factcheck_", suffix=suffix, delete=False) as f:
+                f.write(content)
+            job["path"] = job["temp_path"] = f.name
+            job["filename"] = upload.filename
+        return job
+
+    def _preprocess(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if job["kind"] == "text":
+            job["text"] = re.sub(r'\s+', ' ', job["text"]).strip()
+        return job
+
+    async def _extract(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the extractor for the job's media type and normalise its output to
+        a list of {"claim", "confidence"} dicts; extra fields go in "meta".
+        """
+        kind = job["kind"]
+        if kind == "claims":
+            return job
+        if kind == "text":
+            extracted = await self.extractor.extract_from_text(job["text"])
+            job["claims"] = [{"claim": c["claim"], "confidence": c["confidence"]} for c in extracted]
+            return job
+
+        if kind == "image":
+            extracted = await self.extractor.extract_from_image(job["path"])
+        elif kind == "video":
+            extracted = await self.extractor.extract_from_video(job["path"])
+        else:
+            raise ValueError(f"Unsupported job kind: {kind}")
+        job["claims"] = [{"claim": c["text"], "confidence": c["confidence"]} for c in extracted.get("claims", [])]
+        job["meta"] = {k: v for k, v in extracted.items() if k != "claims"}
+        return job
+
+    # Claim stages
+
+    def _retrieve(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+        stored = self.verifier.lookup(claim["claim"])
+        if stored:
+            claim["verification"] = stored
+            return claim
+        try:
+            claim["evidence"] = self.verifier.retrieve(claim["claim"])
+        except Exception as e:
+            print(f"Error retrieving evidence: {str(e)}")
+            claim["verification"] = self.verifier.error_result(e)
+        return claim
+
+    def _verify(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+        if "verification" in claim:
+            return claim
+        try:
+            claim["verification"] = self.verifier.judge(claim["claim"], claim["evidence"])
+        except Exception as e:
+            print(f"Error verifying claim: {str(e)}")
+            claim["verification"] = self.verifier.error_result(e)
+            claim.pop("evidence")
+        return claim
+
+    def _score(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record fresh verdicts and shape the claim for the response.
+        """
+        evidence = claim.pop("evidence", None)
+        if evidence is not None:
+            claim["verification"] = self.verifier.record(claim["claim"], claim["verification"], evidence,
+                                                         save=claim.get("record", True))
+        return {
+            "claim": claim["claim"],
+            "confidence": claim.get("confidence", 1.0),
+            "verification": claim["verification"]
+        }
@@ -0,0 +1,125 @@
+"""
+Pre-fork multi-worker server.
+
+Models and the FastAPI app are loaded once in the parent process, which then
+forks the workers so model weights are shared copy-on-write instead of being
+duplicated per worker. Run with:
+
+    python -m backend.server --workers 4 --preload minilm
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict, List
+
+def threads_per_worker(workers: int, requested: int = 0) -> int:
+    """
+    Split the available CPUs between workers so their torch thread pools do not oversubscribe.
+    """
+    if requested > 0:
+        return requested
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+def _run_worker(index: int, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+    from backend.main import app
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Only the first worker refreshes stored verdicts
+    if index > 0:
+        os.environ["VERDICT_REFRESH_INTERVAL"] = "0"
+    os.environ["WORKER_INDEX"] = str(index)
+
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def _spawn(index: int, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _run_worker(index, sock, log_level)
+        finally:
+            os._exit(0)
+    return pid
+
+def serve(host: str, port: int, workers: int, preload: List[str], threads: int = 0, log_level: str = "info") -> None:
+    per_worker = threads_per_worker(workers, threads)
+    # Must be set before torch initialises its thread pools
+    os.environ["OMP_NUM_THREADS"] = str(per_worker)
+    os.environ["MKL_NUM_THREADS"] = str(per_worker)
+    import torch
+    torch.set_num_threads(per_worker)
+    torch.set_num_interop_threads(1)
+
+    from backend.model_registry import preload_models
+    preload_models(preload)
+    import backend.main  # builds the app and its components before forking
+    # SQLite connections must not be carried across fork(); each worker reopens its own
+    backend.main.verdict_store.close()
+    backend.main.shared_cache.close()
+
+    # Keep the loaded objects out of the GC's reach so collections in the
+    # workers do not touch (and therefore copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind_socket(host, port)
+    print(f"Starting {workers} workers on {host}:{port} with {per_worker} torch threads each")
+    children: Dict[int, int] = {}
+    for index in range(workers):
+        children[_spawn(index, sock, log_level)] = index
+
+    shutting_down = False
+
+    def _shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or shutting_down:
+            continue
+        print(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+        time.sleep(1)
+        children[_spawn(index, sock, log_level)] = index
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Fact Checker API with pre-forked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "2")))
+    parser.add_argument("--threads", type=int, default=0,
+                        help="torch intra-op threads per worker (default: CPUs / workers)")
+    parser.add_argument("--preload", default=os.getenv("PRELOAD_MODELS", ""),
+                        help="comma-separated models to load before forking, e.g. minilm")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    preload = [name.strip() for name in args.preload.split(",") if name.strip()]
+    serve(args.host, args.port, args.workers, preload, args.threads, args.log_level)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+class SharedCache:
+    """
+    Key-value cache with expiry, backed by SQLite in WAL mode so every worker
+    process reads and fills the same entries.
+    """
+    def __init__(self, path: Optional[str] = None, ttl: float = 3600.0):
+        self.path = path or os.getenv("SHARED_CACHE_PATH", "cache.db")
+        self.ttl = ttl
+        self._pid = None
+        self._connection = None
+        conn = self._conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Open one connection per process so the cache stays usable after forking.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA busy_timeout=5000")
+        return self._connection
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._conn
+        with self._lock:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        conn = self._conn
+        with self._lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+
+    def purge_expired(self) -> int:
+        conn = self._conn
+        with self._lock, conn:
+            return conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            with self._lock:
+                self._connection.close()
+        self._pid = None
+        self._connection = None
@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+import tempfile
+from urllib.parse import parse_qs, urlparse
+import requests
+from backend.claim_verifier import ClaimVerifier
+from backend.shared_cache import SharedCache
+
+class FakePage:
+    def __init__(self, title):
+        self.title = title
+        self.summary = f"{title} is a fruit."
+        self.fullurl = f"https://en.wikipedia.org/wiki/{title}"
+        self.pageid = 1
+        self.lastrevid = 10
+
+    def exists(self):
+        return True
+
+class FakeWiki:
+    def __init__(self):
+        self.fetched = []
+
+    def page(self, title):
+        self.fetched.append(title)
+        return FakePage(title)
+
+def test_wikipedia_lookups_use_shared_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedCache(os.path.join(tmp, "cache.db"))
+        verifier = ClaimVerifier(cache=cache)
+        verifier.wiki = FakeWiki()
+
+        first = verifier.retrieve("Banana is a fruit")
+        second = verifier.retrieve("Banana is a fruit")
+        assert len(verifier.wiki.fetched) == 1
+        assert first["wiki_info"] == second["wiki_info"]
+        assert second["wiki_info"]["pages"][0]["revision"] == 10
+
+        # Refreshing bypasses the cache and stores the new summary
+        verifier.retrieve("Banana is a fruit", use_cache=False)
+        assert len(verifier.wiki.fetched) == 2
+
+def fake_wikipedia_send(session, request, **kwargs):
+    """
+    Answers the MediaWiki API calls wikipediaapi makes for an existing "Banana" page.
+    """
+    prop = parse_qs(urlparse(request.url).query)["prop"][0]
+    page = {"pageid": 38940, "ns": 0, "title": "Banana"}
+    if prop == "extracts":
+        page["extract"] = "A banana is an elongated, edible fruit. Botanically, the banana is a berry."
+    else:
+        page.update(lastrevid=1234, fullurl="https://en.wikipedia.org/wiki/Banana")
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"query": {"pages": {"38940": page}}}).encode()
+    response.url = request.url
+    response.request = request
+    response.elapsed = datetime.timedelta(0)
+    return response
+
+def test_real_wikipedia_client():
+    # Goes through wikipediaapi and requests; only the network transport is stubbed
+    original_send = requests.Session.send
+    requests.Session.send = fake_wikipedia_send
+    try:
+        evidence = ClaimVerifier().retrieve("Banana is a berry", raise_errors=True)
+    finally:
+        requests.Session.send = original_send
+
+    wiki_info = evidence["wiki_info"]
+    assert wiki_info["exists"] is True
+    assert wiki_info["pages"] == [{"page_id": 38940, "revision": 1234, "title": "Banana"}]
+    assert wiki_info["url"] == "https://en.wikipedia.org/wiki/Banana"
+    assert "Botanically, the banana is a berry." in evidence["selection"]["context"]
+
+if __name__ == "__main__":
+    test_wikipedia_lookups_use_shared_cache()
+    test_real_wikipedia_client()
+    print("Claim verifier tests passed")
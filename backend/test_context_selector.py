@@ -0,0 +1,49 @@
+from backend.context_selector import estimate_tokens, rank_sentences, select_context
+
+BANANA = (
+    "A banana is an elongated, edible fruit produced by several kinds of large herbaceous flowering plants. "
+    "In some countries, bananas used for cooking may be called plantains. "
+    "Botanically, the banana is a berry. "
+    "The fruit is variable in size, color, and firmness. "
+    "Almost all modern edible seedless bananas come from two wild species. "
+    "Bananas are cultivated in at least 135 countries."
+)
+
+def test_rank_sentences():
+    sentences = ["Botanically, the banana is a berry.", "Bananas are cultivated in many countries."]
+    scores = rank_sentences("Banana is a berry", sentences)
+    assert scores[0] > scores[1]
+
+def test_select_context_budget():
+    selection = select_context("Banana is a berry", [BANANA], budget=40)
+    assert selection["context_tokens"] <= 40
+    assert selection["original_tokens"] == estimate_tokens(BANANA)
+    assert "Botanically, the banana is a berry." in selection["context"]
+    # Selected sentences keep their original order
+    assert selection["context"].index("elongated") < selection["context"].index("Botanically")
+    assert selection["sentences_selected"] < selection["sentences_total"]
+
+def test_lead_sentences_first():
+    lead = "A banana is an elongated, edible fruit produced by several kinds of large herbaceous flowering plants."
+    berry = "Botanically, the banana is a berry."
+    pluto = "Pluto is a dwarf planet. It orbits the Sun."
+    # Leads are packed before better-ranked sentences, even when they do not match the claim
+    selection = select_context("Banana is a berry", [BANANA, pluto], budget=1000)
+    assert selection["context"].startswith(lead)
+    assert "Pluto is a dwarf planet." in selection["context"]
+    # A lead that no longer fits is dropped and the budget goes to the best match
+    budget = estimate_tokens(lead) + estimate_tokens(berry)
+    selection = select_context("Banana is a berry", [BANANA, "Pluto is a dwarf planet in the Kuiper belt."], budget=budget)
+    assert selection["context"] == f"{lead} {berry}"
+
+def test_select_context_empty():
+    selection = select_context("Banana is a berry", [], budget=40)
+    assert selection["context"] == ""
+    assert selection["original_tokens"] == 0
+
+if __name__ == "__main__":
+    test_rank_sentences()
+    test_select_context_budget()
+    test_lead_sentences_first()
+    test_select_context_empty()
+    print("Context selector tests passed")
@@ -1,5 +1,5 @@
 import asyncio
-from credibility_checker import CredibilityChecker
+from backend.credibility_checker import CredibilityChecker
 
 async def test_credibility_checker():
     checker = CredibilityChecker()
@@ -1,7 +1,7 @@
 # test_fact_checker.py
 
 import asyncio
-from credibility_score import CredibilityScorer
+from backend.credibility_score import CredibilityScorer
 
 async def run_tests():
     scorer = CredibilityScorer()
@@ -0,0 +1,92 @@
+import asyncio
+from backend.live_session import LiveCheckSession, complete_sentences, parse_update
+from backend.text_utils import split_sentences
+
+class FakeChecker:
+    def __init__(self):
+        self.seen = []
+
+    async def __call__(self, sentence):
+        self.seen.append(sentence)
+        verification = {'credibility_score': 100, 'verdict': 'True', 'explanation': '', 'sources': []}
+        return [{'claim': sentence, 'confidence': 1.0, 'verification': verification}]
+
+async def incremental_updates():
+    checker = FakeChecker()
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    session = LiveCheckSession(checker, send, debounce=0)
+
+    delta = await session.update("The Earth orbits the Sun. Water boils at 100 degrees.")
+    assert [item['sentence'] for item in delta['added']] == [
+        "The Earth orbits the Sun.", "Water boils at 100 degrees."
+    ]
+    await asyncio.gather(*session.tasks.values())
+    assert sorted(checker.seen) == ["The Earth orbits the Sun.", "Water boils at 100 degrees."]
+
+    # Editing one sentence only re-checks that sentence
+    delta = await session.update("The Earth orbits the Sun. Water boils at 90 degrees.")
+    assert delta['removed'] == ["Water boils at 100 degrees."]
+    assert [item['sentence'] for item in delta['added']] == ["Water boils at 90 degrees."]
+    await asyncio.gather(*session.tasks.values())
+    assert checker.seen.count("The Earth orbits the Sun.") == 1
+    assert "Water boils at 100 degrees." not in session.results
+
+    # Restoring a sentence that is still known reuses its result
+    seen_before = len(checker.seen)
+    await session.update("The Earth orbits the Sun. Water boils at 90 degrees. The Earth orbits the Sun.")
+    assert len(checker.seen) == seen_before
+    assert messages[-1] == {
+        'type': 'result',
+        'sentence': "The Earth orbits the Sun.",
+        'claims': session.results["The Earth orbits the Sun."]
+    }
+    session.close()
+
+async def unfinished_sentences():
+    checker = FakeChecker()
+
+    async def send(message):
+        pass
+
+    session = LiveCheckSession(checker, send, debounce=0.05)
+
+    # The fragment being typed is not checked until it is finished
+    delta = await session.update("The Earth orbits the Sun. Water boils at")
+    assert [item['sentence'] for item in delta['added']] == ["The Earth orbits the Sun."]
+    # A sentence edited away within the debounce window never reaches the checker
+    await session.update("The Earth orbits the Sun. Water boils at 10.")
+    await session.update("The Earth orbits the Sun. Water boils at 100.")
+    await asyncio.gather(*session.tasks.values())
+    assert sorted(checker.seen) == ["The Earth orbits the Sun.", "Water boils at 100."]
+    session.close()
+
+def test_incremental_updates():
+    asyncio.run(incremental_updates())
+
+def test_unfinished_sentences():
+    asyncio.run(unfinished_sentences())
+
+def test_parse_update():
+    assert parse_update('{"text": "The Earth orbits the Sun."}') == "The Earth orbits the Sun."
+    assert parse_update('{}') == ""
+    for raw in ['not json', '["a list"]', '{"text": 42}']:
+        try:
+            parse_update(raw)
+        except ValueError:
+            continue
+        raise AssertionError(f"Accepted malformed message: {raw}")
+
+def test_split_sentences():
+    assert split_sentences("One. Two!\nThree?  ") == ["One.", "Two!", "Three?"]
+    assert complete_sentences('He said "yes." Then he left') == ['He said "yes."']
+
+if __name__ == "__main__":
+    test_split_sentences()
+    test_parse_update()
+    test_incremental_updates()
+    test_unfinished_sentences()
+    print("Live session tests passed")
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+from PIL import Image
+from backend import ocr
+
+class FakeTesseract:
+    """
+    Stands in for pytesseract, returning the given words as one line of text.
+    """
+    class Output:
+        DICT = "dict"
+
+    def __init__(self, words, confidence=95.0, box=(60, 30), error=None):
+        self.words = words
+        self.confidence = confidence
+        self.box = box
+        self.error = error
+
+    def image_to_data(self, image, output_type=None):
+        if self.error:
+            raise self.error
+        count = len(self.words)
+        return {
+            "text": list(self.words),
+            "conf": [self.confidence] * count,
+            "width": [self.box[0]] * count,
+            "height": [self.box[1]] * count,
+            "block_num": [1] * count,
+            "par_num": [1] * count,
+            "line_num": [1] * count
+        }
+
+HEADLINE = "Scientists confirm the Great Wall of China is visible from space".split()
+
+def route_with(tesseract):
+    original = ocr.pytesseract
+    ocr.pytesseract = tesseract
+    try:
+        return ocr.choose_route(Image.new("RGB", (400, 200), "white"))
+    finally:
+        ocr.pytesseract = original
+
+def test_choose_route():
+    assert route_with(None) == {"path": "vision", "reason": "ocr_unavailable"}
+    assert route_with(FakeTesseract(HEADLINE, error=RuntimeError("tesseract not found"))) == {
+        "path": "vision", "reason": "ocr_failed"
+    }
+
+    # Too few words to be a screenshot of text
+    route = route_with(FakeTesseract(["STOP"]))
+    assert (route["path"], route["reason"], route["word_count"]) == ("vision", "not_text_dominant", 1)
+
+    route = route_with(FakeTesseract(HEADLINE, confidence=40.0))
+    assert (route["path"], route["reason"], route["ocr_confidence"]) == ("vision", "low_ocr_confidence", 40.0)
+
+    route = route_with(FakeTesseract(HEADLINE))
+    assert route["path"] == "ocr" and route["reason"] == "text_dominant"
+    assert route["text"] == " ".join(HEADLINE)
+    assert route["word_count"] == len(HEADLINE)
+    # The image is upscaled 2x before OCR: 11 boxes of 60x30 over 800x400
+    assert route["text_coverage"] == round(11 * 60 * 30 / (800 * 400), 3)
+
+def test_extract_from_image_ocr_branch():
+    # Imported here: claim_extractor pulls in transformers and torch
+    from backend import claim_extractor
+    extractor = claim_extractor.ClaimExtractor()
+    seen = []
+
+    async def extract_from_text(text):
+        seen.append(text)
+        return [{"claim": "The Great Wall of China is visible from space", "confidence": 1.0}]
+
+    def choose_route(image):
+        return {"path": "ocr", "reason": "text_dominant", "text": " ".join(HEADLINE), "word_count": len(HEADLINE)}
+
+    def query_ollama(*args, **kwargs):
+        raise AssertionError("The vision model must not be called for text-dominant images")
+
+    extractor.extract_from_text = extract_from_text
+    original_route, original_query = claim_extractor.choose_route, claim_extractor.query_ollama
+    claim_extractor.choose_route, claim_extractor.query_ollama = choose_route, query_ollama
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "screenshot.png")
+            Image.new("RGB", (400, 200), "white").save(path)
+            result = asyncio.run(extractor.extract_from_image(path))
+    finally:
+        claim_extractor.choose_route, claim_extractor.query_ollama = original_route, original_query
+
+    assert seen == [" ".join(HEADLINE)]
+    assert result["claims"] == [{"text": "The Great Wall of China is visible from space", "confidence": 1.0}]
+    assert result["ocr_text"] == " ".join(HEADLINE)
+    assert result["route"] == {"path": "ocr", "reason": "text_dominant", "word_count": len(HEADLINE)}
+
+if __name__ == "__main__":
+    test_choose_route()
+    test_extract_from_image_ocr_branch()
+    print("OCR tests passed")
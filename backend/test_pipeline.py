@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from backend.pipeline import Pipeline
+
+class FakeExtractor:
+    async def extract_from_text(self, text):
+        return [{'claim': sentence.strip(), 'confidence': 0.9} for sentence in text.split('.') if sentence.strip()]
+
+    async def extract_from_image(self, image_path):
+        return {'claims': [{'text': 'A cat is on the mat', 'confidence': 1.0}], 'image_path': image_path,
+                'route': {'path': 'vision'}}
+
+class FakeVerifier:
+    def __init__(self):
+        self.judged = []
+        self.recorded = []
+
+    def lookup(self, claim):
+        if claim == "Stored claim":
+            return {'credibility_score': 90, 'verdict': 'True', 'freshness': {'cached': True}}
+        return None
+
+    def retrieve(self, claim):
+        return {'claim': claim}
+
+    def judge(self, claim, evidence):
+        if claim == "Broken claim":
+            raise ValueError("Invalid JSON in response")
+        self.judged.append(claim)
+        return {'credibility_score': 50, 'verdict': 'Partially true'}
+
+    def record(self, claim, result, evidence, save=True):
+        if save:
+            self.recorded.append(claim)
+        return dict(result, freshness={'cached': False})
+
+    @staticmethod
+    def error_result(error):
+        return {'credibility_score': 0, 'verdict': 'False', 'explanation': f"Error during fact-checking: {error}"}
+
+async def document_flow():
+    verifier = FakeVerifier()
+    pipeline = Pipeline(FakeExtractor(), verifier)
+    check = pipeline.flow("ingest", "preprocess", "extract", "retrieve", "verify", "score")
+
+    job = await check({"kind": "text", "text": "Bananas are berries.   Stored claim. Broken claim."})
+    assert [c["claim"] for c in job["claims"]] == ["Bananas are berries", "Stored claim", "Broken claim"]
+    bananas, stored, broken = job["claims"]
+    assert bananas == {
+        "claim": "Bananas are berries",
+        "confidence": 0.9,
+        "verification": {'credibility_score': 50, 'verdict': 'Partially true', 'freshness': {'cached': False}}
+    }
+    assert stored["verification"]["freshness"]["cached"] is True
+    assert broken["verification"]["explanation"].startswith("Error during fact-checking")
+    # Only fresh, successful verdicts are judged and recorded
+    assert verifier.judged == ["Bananas are berries"]
+    assert verifier.recorded == ["Bananas are berries"]
+    pipeline.close()
+
+async def claims_and_image_flows():
+    pipeline = Pipeline(FakeExtractor(), FakeVerifier())
+    job = await pipeline.flow("retrieve", "verify", "score")({
+        "kind": "claims",
+        "claims": [{"claim": "Bananas are berries", "confidence": 1.0}]
+    })
+    assert job["claims"][0]["verification"]["verdict"] == "Partially true"
+
+    job = await pipeline.flow("extract")({"kind": "image", "path": "photo.png"})
+    assert job["claims"] == [{"claim": "A cat is on the mat", "confidence": 1.0}]
+    assert job["meta"]["route"] == {"path": "vision"}
+    pipeline.close()
+
+async def stage_concurrency_limit():
+    running, peak = 0, 0
+
+    class SlowVerifier(FakeVerifier):
+        def judge(self, claim, evidence):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            time.sleep(0.02)
+            running -= 1
+            return super().judge(claim, evidence)
+
+    pipeline = Pipeline(FakeExtractor(), SlowVerifier(), concurrency={"verify": 2})
+    check = pipeline.flow("retrieve", "verify", "score")
+    claims = [{"claim": f"Claim {i}", "confidence": 1.0} for i in range(6)]
+    await asyncio.gather(*(check({"kind": "claims", "claims": [claim]}) for claim in claims))
+    assert peak <= 2
+    pipeline.close()
+
+async def stage_executors():
+    threads = {}
+
+    class RecordingVerifier(FakeVerifier):
+        def retrieve(self, claim):
+            threads["retrieve"] = threading.current_thread().name
+            return super().retrieve(claim)
+
+        def judge(self, claim, evidence):
+            threads["verify"] = threading.current_thread().name
+            return super().judge(claim, evidence)
+
+    pipeline = Pipeline(FakeExtractor(), RecordingVerifier())
+    await pipeline.flow("retrieve", "verify", "score")({"kind": "claims", "claims": [{"claim": "Claim"}]})
+    # Each blocking stage runs on its own pool, sized to its concurrency
+    assert threads["retrieve"].startswith("stage-retrieve")
+    assert threads["verify"].startswith("stage-verify")
+    executor = pipeline.stages["verify"]._executor
+    assert executor._max_workers == pipeline.stages["verify"].concurrency
+    pipeline.close()
+    assert executor._shutdown
+    assert pipeline.stages["verify"]._executor is None
+
+def test_document_flow():
+    asyncio.run(document_flow())
+
+def test_claims_and_image_flows():
+    asyncio.run(claims_and_image_flows())
+
+def test_stage_concurrency_limit():
+    asyncio.run(stage_concurrency_limit())
+
+def test_stage_executors():
+    asyncio.run(stage_executors())
+
+def test_new_event_loop():
+    pipeline = Pipeline(FakeExtractor(), FakeVerifier())
+    check = pipeline.flow("retrieve", "verify", "score")
+    job = {"kind": "claims", "claims": [{"claim": "Bananas are berries"}]}
+    # Each asyncio.run is a new loop, as with a restarted server; the stages must follow it
+    for _ in range(2):
+        result = asyncio.run(asyncio.wait_for(check(dict(job)), timeout=5))
+        assert result["claims"][0]["verification"]["verdict"] == "Partially true"
+    pipeline.close()
+
+def test_unrecorded_jobs():
+    verifier = FakeVerifier()
+    pipeline = Pipeline(FakeExtractor(), verifier)
+    check = pipeline.flow("ingest", "preprocess", "extract", "retrieve", "verify", "score")
+    job = asyncio.run(check({"kind": "text", "text": "Bananas are berries.", "record": False}))
+    assert job["claims"][0]["verification"]["verdict"] == "Partially true"
+    assert "record" not in job["claims"][0]
+    assert verifier.judged == ["Bananas are berries"]
+    assert verifier.recorded == []
+    pipeline.close()
+
+def test_unknown_stage():
+    pipeline = Pipeline(FakeExtractor(), FakeVerifier())
+    try:
+        pipeline.flow("extract", "summarize")
+    except ValueError:
+        return
+    raise AssertionError("Unknown stage was accepted")
+
+if __name__ == "__main__":
+    test_document_flow()
+    test_claims_and_image_flows()
+    test_stage_concurrency_limit()
+    test_stage_executors()
+    test_new_event_loop()
+    test_unrecorded_jobs()
+    test_unknown_stage()
+    print("Pipeline tests passed")
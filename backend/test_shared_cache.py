@@ -0,0 +1,22 @@
+import os
+import tempfile
+from backend.shared_cache import SharedCache
+
+def test_shared_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedCache(os.path.join(tmp, "cache.db"))
+        cache.set("wiki:summary:Banana", {"exists": True, "revision": 10})
+        cache.set("wiki:summary:Pluto", {"exists": False}, ttl=-1)
+        assert cache.get("wiki:summary:Banana") == {"exists": True, "revision": 10}
+        assert cache.get("wiki:summary:Pluto") is None
+        assert cache.purge_expired() == 1
+
+        # Closing drops the connection; the next call reopens it
+        cache.close()
+        assert cache._connection is None
+        assert cache.get("wiki:summary:Banana") == {"exists": True, "revision": 10}
+        cache.close()
+
+if __name__ == "__main__":
+    test_shared_cache()
+    print("Shared cache tests passed")
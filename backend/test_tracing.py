@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from backend import tracing
+
+@tracing.traced("outer")
+async def outer():
+    with tracing.span("inner", kind="http"):
+        await asyncio.to_thread(time.sleep, 0.01)
+
+def test_request_trace():
+    original_dir, original_export = tracing.TRACE_DIR, tracing.TRACE_EXPORT
+    with tempfile.TemporaryDirectory() as tmp:
+        tracing.TRACE_DIR, tracing.TRACE_EXPORT = tmp, ["json", "otlp"]
+        try:
+            with tracing.request_trace("GET /") as trace:
+                asyncio.run(outer())
+            tracing.flush_exports()
+        finally:
+            tracing.TRACE_DIR, tracing.TRACE_EXPORT = original_dir, original_export
+
+        names = [span.name for span in trace.spans]
+        assert names == ["GET /", "outer", "inner"]
+        root, outer_span, inner_span = trace.spans
+        assert outer_span.parent_id == root.span_id
+        assert inner_span.parent_id == outer_span.span_id
+        assert inner_span.end_ns - inner_span.start_ns >= 10_000_000
+
+        with open(os.path.join(tmp, "traces.jsonl")) as f:
+            exported = json.loads(f.readline())
+        assert exported["trace_id"] == trace.trace_id
+        with open(os.path.join(tmp, "otlp-traces.jsonl")) as f:
+            otlp = json.loads(f.readline())
+        spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[2]["attributes"] == [{"key": "kind", "value": {"stringValue": "http"}}]
+
+def test_export_rotation():
+    original = tracing.TRACE_DIR, tracing.TRACE_EXPORT, tracing.TRACE_MAX_BYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        tracing.TRACE_DIR, tracing.TRACE_EXPORT, tracing.TRACE_MAX_BYTES = tmp, ["json"], 1
+        try:
+            for _ in range(3):
+                with tracing.request_trace("GET /"):
+                    pass
+            tracing.flush_exports()
+        finally:
+            tracing.TRACE_DIR, tracing.TRACE_EXPORT, tracing.TRACE_MAX_BYTES = original
+
+        # Each write found the file over the limit and rotated it first
+        assert sorted(os.listdir(tmp)) == ["traces.jsonl", "traces.jsonl.1"]
+        with open(os.path.join(tmp, "traces.jsonl")) as f:
+            assert len(f.readlines()) == 1
+
+def test_export_disabled():
+    original_dir, original_export = tracing.TRACE_DIR, tracing.TRACE_EXPORT
+    with tempfile.TemporaryDirectory() as tmp:
+        tracing.TRACE_DIR, tracing.TRACE_EXPORT = os.path.join(tmp, "traces"), []
+        try:
+            with tracing.request_trace("GET /"):
+                pass
+            tracing.flush_exports()
+        finally:
+            tracing.TRACE_DIR, tracing.TRACE_EXPORT = original_dir, original_export
+        assert not os.path.exists(os.path.join(tmp, "traces"))
+
+def test_span_outside_trace():
+    with tracing.span("ignored") as s:
+        assert s is None
+
+def test_sampling_profiler():
+    profiler = tracing.SamplingProfiler(interval=0.001)
+    profiler.start()
+    deadline = time.time() + 0.05
+    while time.time() < deadline:
+        sum(range(1000))
+    folded = profiler.stop()
+    assert "test_sampling_profiler" in folded
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+
+if __name__ == "__main__":
+    test_request_trace()
+    test_export_rotation()
+    test_export_disabled()
+    test_span_outside_trace()
+    test_sampling_profiler()
+    print("Tracing tests passed")
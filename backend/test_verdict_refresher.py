@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+from backend.claim_verifier import ClaimVerifier
+from backend.credibility_checker import CredibilityChecker
+from backend.verdict_refresher import VerdictRefresher
+from backend.verdict_store import VerdictStore
+
+VERDICT = {"credibility_score": 100, "verdict": "True", "explanation": "", "sources": []}
+
+class FakeChecker:
+    def __init__(self, revisions):
+        self.revisions = revisions
+
+    def get_latest_revisions(self, page_ids):
+        return {page_id: self.revisions[page_id] for page_id in page_ids if page_id in self.revisions}
+
+class FakeVerifier:
+    def __init__(self, store, pages, unavailable=()):
+        self.store = store
+        self.pages = pages
+        self.unavailable = unavailable
+        self.judged = []
+
+    def retrieve(self, claim, use_cache=True, raise_errors=False):
+        assert not use_cache and raise_errors
+        if claim in self.unavailable:
+            raise ConnectionError("Wikipedia unavailable")
+        return {"wiki_info": {"pages": self.pages.get(claim, [])}}
+
+    def judge(self, claim, evidence):
+        self.judged.append(claim)
+        return dict(VERDICT, verdict="Revised")
+
+    def record(self, claim, result, evidence):
+        self.store.save(claim, result, evidence["wiki_info"]["pages"])
+        return result
+
+def test_refresh_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VerdictStore(os.path.join(tmp, "verdicts.db"))
+        store.save("Banana is a fruit", VERDICT, [{"page_id": 1, "revision": 10}])
+        store.save("Pluto is a planet", VERDICT, [{"page_id": 2, "revision": 20}])
+        store.save("Mars is red", VERDICT, [{"page_id": 3, "revision": 30}])
+        store.save("Dodo is alive", VERDICT, [{"page_id": 4, "revision": 40}])
+
+        # Page 1 is unchanged, page 2 was edited, page 3's lookup failed, page 4 was deleted
+        checker = FakeChecker({1: 10, 2: 21, 4: None})
+        verifier = FakeVerifier(store, {"Pluto is a planet": [{"page_id": 2, "revision": 21}]})
+        refresher = VerdictRefresher(store, verifier, checker)
+        store.mark_checked(checked_at=1.0)
+
+        stats = asyncio.run(refresher.refresh_once())
+        assert stats == {"pages_checked": 3, "pages_changed": 2, "claims_reverified": 2, "claims_failed": 0}
+        assert sorted(verifier.judged) == ["Pluto is a planet"]
+        assert store.get("Pluto is a planet")["verdict"] == "Revised"
+        assert store.tracked_revisions() == {1: 10, 2: 21, 3: 30}
+        # A deleted source page drops the verdict instead of keeping it stale forever
+        assert store.get("Dodo is alive") is None
+        assert store.get("Banana is a fruit")["freshness"]["revisions_checked_at"] > 1.0
+        assert store.get("Mars is red")["freshness"]["revisions_checked_at"] == 1.0
+        store.close()
+
+def test_failed_lookups_keep_verdicts():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VerdictStore(os.path.join(tmp, "verdicts.db"))
+        store.save("Pluto is a planet", VERDICT, [{"page_id": 2, "revision": 20}])
+        store.save("Mars is red", VERDICT, [{"page_id": 3, "revision": 30}])
+
+        # Both pages were edited; the lookup for Pluto fails, Mars's page is found under no topic
+        checker = FakeChecker({2: 21, 3: 31})
+        verifier = FakeVerifier(store, {}, unavailable=["Pluto is a planet"])
+        refresher = VerdictRefresher(store, verifier, checker)
+        store.mark_checked(checked_at=1.0)
+
+        stats = asyncio.run(refresher.refresh_once())
+        assert stats == {"pages_checked": 2, "pages_changed": 2, "claims_reverified": 0, "claims_failed": 2}
+        assert verifier.judged == []
+        # Nothing is deleted while the source pages still exist; both are retried next pass
+        assert store.tracked_revisions() == {2: 20, 3: 30}
+        assert store.get("Pluto is a planet")["freshness"]["revisions_checked_at"] == 1.0
+        assert store.get("Mars is red")["freshness"]["revisions_checked_at"] == 1.0
+        store.close()
+
+def test_sourceless_verdicts_are_not_persisted():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VerdictStore(os.path.join(tmp, "verdicts.db"))
+        verifier = ClaimVerifier(store=store)
+        result = verifier.record("Unknown topic", dict(VERDICT), {"wiki_info": {"pages": []}})
+        assert result["freshness"]["cached"] is False
+        assert store.get("Unknown topic") is None
+        store.close()
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+def test_get_latest_revisions_batches():
+    checker = CredibilityChecker()
+    calls = []
+
+    def fake_get(url, params):
+        ids = params["pageids"].split("|")
+        calls.append(ids)
+        if "5" in ids:
+            raise ConnectionError("Wikipedia unavailable")
+        pages = {page_id: {"pageid": int(page_id), "lastrevid": int(page_id) * 10} for page_id in ids}
+        pages["2"] = {"pageid": 2, "missing": ""}
+        return FakeResponse({"query": {"pages": pages}})
+
+    checker.session.get = fake_get
+    revisions = checker.get_latest_revisions([1, 2, 3, 4, 5], batch_size=2)
+    assert calls == [["1", "2"], ["3", "4"], ["5"]]
+    # Missing pages map to None; pages from a failed batch are left out
+    assert revisions == {1: 10, 2: None, 3: 30, 4: 40}
+
+if __name__ == "__main__":
+    test_refresh_once()
+    test_failed_lookups_keep_verdicts()
+    test_sourceless_verdicts_are_not_persisted()
+    test_get_latest_revisions_batches()
+    print("Verdict refresher tests passed")
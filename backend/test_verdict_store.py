@@ -0,0 +1,37 @@
+import os
+import tempfile
+from backend.verdict_store import VerdictStore
+
+def test_verdict_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VerdictStore(os.path.join(tmp, "verdicts.db"))
+        result = {
+            "credibility_score": 100,
+            "verdict": "True",
+            "explanation": "Bananas are botanically berries.",
+            "sources": []
+        }
+        store.save("Banana is a fruit.", result, [
+            {"page_id": 38940, "revision": 1000, "title": "Banana"}
+        ])
+
+        # Normalized lookups hit the same entry
+        stored = store.get("banana is a fruit")
+        assert stored["verdict"] == "True"
+        assert stored["freshness"]["cached"] is True
+        assert store.get("Banana is a vegetable") is None
+
+        assert store.tracked_revisions() == {38940: 1000}
+        assert store.claims_for_pages({38940: 1000}) == []
+        assert store.claims_for_pages({38940: 1001}) == ["Banana is a fruit."]
+        assert store.claims_for_pages({38940: None}) == ["Banana is a fruit."]
+
+        store.mark_checked(checked_at=1.0, exclude=["Banana is a fruit."])
+        assert store.get("Banana is a fruit.")["freshness"]["revisions_checked_at"] != 1.0
+        store.mark_checked(checked_at=2.0)
+        assert store.get("Banana is a fruit.")["freshness"]["revisions_checked_at"] == 2.0
+        store.close()
+        print("Verdict store tests passed")
+
+if __name__ == "__main__":
+    test_verdict_store()
@@ -0,0 +1,9 @@
+import re
+from typing import List
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on terminal punctuation and line breaks.
+    """
+    parts = re.split(r'(?<=[.!?])\s+|(?<=[.!?]["\')\]])\s+|\n+', text)
+    return [part.strip() for part in parts if part.strip()]
@@ -0,0 +1,282 @@
+"""
+Lightweight span tracing and on-demand sampling profiling.
+
+A trace is started per request; `span()` and `@traced` record nested timed
+spans into it from any coroutine or worker thread that inherits the request
+context. Export is opt-in: with TRACE_EXPORT set to "json", "otlp" or both,
+finished traces are appended to local files in TRACE_DIR as plain JSON lines
+(traces.jsonl) and/or OTLP/JSON export requests (otlp-traces.jsonl). Files are
+written from a background thread and rotated to <file>.1 at TRACE_MAX_BYTES.
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+TRACE_EXPORT = [fmt.strip() for fmt in os.getenv("TRACE_EXPORT", "").split(",") if fmt.strip()]
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+class Span:
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "spans": [span.to_dict() for span in self.spans]
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        Encode the trace as an OTLP/JSON ExportTraceServiceRequest.
+        """
+        spans = []
+        for span in self.spans:
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "fact-checker"}}]},
+                "scopeSpans": [{"scope": {"name": "backend.tracing"}, "spans": spans}]
+            }]
+        }
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a child of the current span. Does nothing outside a trace.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(trace, name, parent.span_id if parent else None, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator recording each call of a sync or async function as a span.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def request_trace(name: str, **attributes):
+    """
+    Start a new trace with a root span, and export it when the block exits.
+    """
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        with span(name, **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        export_trace(trace)
+
+class _Exporter:
+    """
+    Writes finished traces from a background thread so request handlers never
+    wait on file I/O. The thread is started lazily in each process, since
+    threads do not survive fork.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._pid = None
+
+    def submit(self, trace: Trace) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), name="trace-exporter", daemon=True).start()
+                self._pid = os.getpid()
+        self._queue.put(trace)
+
+    def flush(self) -> None:
+        """
+        Block until every submitted trace has been written.
+        """
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def _run(self, traces: queue.Queue) -> None:
+        while True:
+            trace = traces.get()
+            try:
+                write_trace(trace)
+            finally:
+                traces.task_done()
+
+_exporter = _Exporter()
+atexit.register(_exporter.flush)
+
+def export_trace(trace: Trace) -> None:
+    """
+    Queue a finished trace for export. Does nothing unless TRACE_EXPORT is set.
+    """
+    if TRACE_EXPORT:
+        _exporter.submit(trace)
+
+def flush_exports() -> None:
+    _exporter.flush()
+
+def _append_line(filename: str, line: str) -> None:
+    path = os.path.join(TRACE_DIR, filename)
+    if TRACE_MAX_BYTES and os.path.exists(path) and os.path.getsize(path) >= TRACE_MAX_BYTES:
+        os.replace(path, path + ".1")
+    with open(path, "a") as f:
+        f.write(line + "\n")
+
+def write_trace(trace: Trace) -> None:
+    try:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        if "json" in TRACE_EXPORT:
+            _append_line("traces.jsonl", json.dumps(trace.to_dict(), default=str))
+        if "otlp" in TRACE_EXPORT:
+            _append_line("otlp-traces.jsonl", json.dumps(trace.to_otlp(), default=str))
+    except Exception as e:
+        print(f"Error exporting trace: {str(e)}")
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of all threads at a fixed interval and aggregates
+    them in collapsed ("folded") format, ready for flamegraph.pl or speedscope.
+    Other requests running concurrently are sampled too, so profile under low load.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return self.folded()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+def save_profile(trace_id: str, folded: str) -> str:
+    path = os.path.join(TRACE_DIR, "profiles", f"{trace_id}.folded")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(folded)
+    return path
+
+def load_profile(trace_id: str) -> Optional[str]:
+    if not trace_id.isalnum():
+        return None
+    path = os.path.join(TRACE_DIR, "profiles", f"{trace_id}.folded")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from typing import Dict, Any
+from .claim_verifier import ClaimVerifier
+from .credibility_checker import CredibilityChecker
+from .tracing import request_trace
+from .verdict_store import VerdictStore
+
+class VerdictRefresher:
+    """
+    Re-verifies stored claims whose Wikipedia source pages have changed since they were verified.
+    """
+    def __init__(self, store: VerdictStore, verifier: ClaimVerifier, checker: CredibilityChecker):
+        self.store = store
+        self.verifier = verifier
+        self.checker = checker
+
+    async def refresh_once(self) -> Dict[str, Any]:
+        """
+        Run a single refresh pass and report what was checked and re-verified.
+        The Wikipedia and LLM calls block, so the pass runs in a worker thread
+        to keep the server's event loop responsive.
+        """
+        return await asyncio.to_thread(self._refresh)
+
+    def _refresh(self) -> Dict[str, Any]:
+        started = time.time()
+        tracked = self.store.tracked_revisions()
+        current = self.checker.get_latest_revisions(list(tracked.keys()))
+        changed = {page_id: rev for page_id, rev in current.items() if rev != tracked[page_id]}
+        stale_claims = self.store.claims_for_pages(changed)
+        # Claims relying on a page that no longer exists
+        orphaned = set(self.store.claims_for_pages({page_id: None for page_id, rev in changed.items() if rev is None}))
+
+        failed = []
+        for claim in stale_claims:
+            if not self._reverify(claim, claim in orphaned):
+                failed.append(claim)
+
+        # Pages whose revision lookup failed are left unconfirmed
+        unchecked = self.store.claims_for_pages({page_id: None for page_id in tracked if page_id not in current})
+        self.store.mark_checked(started, exclude=stale_claims + unchecked)
+
+        return {
+            "pages_checked": len(current),
+            "pages_changed": len(changed),
+            "claims_reverified": len(stale_claims) - len(failed),
+            "claims_failed": len(failed)
+        }
+
+    def _reverify(self, claim: str, source_deleted: bool = False) -> bool:
+        """
+        Re-verify one claim. Failed lookups keep the stored verdict for the next pass.
+        """
+        try:
+            # The source pages changed, so cached summaries are out of date
+            evidence = self.verifier.retrieve(claim, use_cache=False, raise_errors=True)
+            if not evidence["wiki_info"].get("pages"):
+                if not source_deleted:
+                    print(f"No Wikipedia sources found for claim, keeping stored verdict: {claim}")
+                    return False
+                # The sources are gone, so the verdict can no longer be kept fresh
+                self.store.delete(claim)
+                return True
+            result = self.verifier.judge(claim, evidence)
+            self.verifier.record(claim, result, evidence)
+            return True
+        except Exception as e:
+            print(f"Error re-verifying claim: {str(e)}")
+            return False
+
+    async def run(self, interval: float = 3600.0) -> None:
+        """
+        Refresh stored verdicts forever, sleeping interval seconds between passes.
+        """
+        while True:
+            try:
+                with request_trace("verdict_refresh"):
+                    stats = await self.refresh_once()
+                print(f"Verdict refresh: {stats}")
+            except Exception as e:
+                print(f"Error refreshing verdicts: {str(e)}")
+            await asyncio.sleep(interval)
@@ -0,0 +1,162 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+class VerdictStore:
+    """
+    Persistent store of claim verdicts and the Wikipedia revisions they were based on.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("VERDICT_STORE_PATH", "verdicts.db")
+        self._pid = None
+        self._connection = None
+        conn = self._conn
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                claim_key TEXT PRIMARY KEY,
+                claim TEXT NOT NULL,
+                result TEXT NOT NULL,
+                verified_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS verdict_sources (
+                claim_key TEXT NOT NULL,
+                page_id INTEGER NOT NULL,
+                revision INTEGER NOT NULL,
+                title TEXT,
+                PRIMARY KEY (claim_key, page_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_verdict_sources_page ON verdict_sources(page_id);
+        """)
+        conn.commit()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Open one connection per process so the store stays usable after forking.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA busy_timeout=5000")
+        return self._connection
+
+    @staticmethod
+    def claim_key(claim: str) -> str:
+        """
+        Normalize a claim so trivially different spellings share one entry.
+        The key is the claim text only: verdicts produced under a different model
+        or context budget are served as-is, so use a separate store path
+        (VERDICT_STORE_PATH) per configuration or clear the store when changing it.
+        """
+        key = re.sub(r'[^\w\s]', '', claim.lower())
+        return re.sub(r'\s+', ' ', key).strip()
+
+    def get(self, claim: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored verdict for a claim with its freshness metadata, or None.
+        """
+        conn = self._conn
+        with self._lock:
+            row = conn.execute(
+                "SELECT result, verified_at, checked_at FROM verdicts WHERE claim_key = ?",
+                (self.claim_key(claim),)
+            ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row["result"])
+        result["freshness"] = {
+            "cached": True,
+            "verified_at": row["verified_at"],
+            "revisions_checked_at": row["checked_at"]
+        }
+        return result
+
+    def save(self, claim: str, result: Dict[str, Any], pages: List[Dict[str, Any]]) -> None:
+        """
+        Record a verdict together with the page IDs and revisions it relied on.
+        Each page is a dict with "page_id", "revision" and optionally "title".
+        """
+        key = self.claim_key(claim)
+        now = time.time()
+        stored = {k: v for k, v in result.items() if k != "freshness"}
+        conn = self._conn
+        with self._lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (claim_key, claim, result, verified_at, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, claim, json.dumps(stored), now, now)
+            )
+            conn.execute("DELETE FROM verdict_sources WHERE claim_key = ?", (key,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO verdict_sources (claim_key, page_id, revision, title) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, int(p["page_id"]), int(p["revision"]), p.get("title")) for p in pages]
+            )
+
+    def delete(self, claim: str) -> None:
+        key = self.claim_key(claim)
+        conn = self._conn
+        with self._lock, conn:
+            conn.execute("DELETE FROM verdicts WHERE claim_key = ?", (key,))
+            conn.execute("DELETE FROM verdict_sources WHERE claim_key = ?", (key,))
+
+    def tracked_revisions(self) -> Dict[int, int]:
+        """
+        Map every page ID referenced by a stored verdict to the oldest revision relied on.
+        """
+        conn = self._conn
+        with self._lock:
+            rows = conn.execute(
+                "SELECT page_id, MIN(revision) AS revision FROM verdict_sources GROUP BY page_id"
+            ).fetchall()
+        return {row["page_id"]: row["revision"] for row in rows}
+
+    def claims_for_pages(self, page_revisions: Dict[int, Optional[int]]) -> List[str]:
+        """
+        Return claims that relied on any of the given pages at a revision other than the
+        given current one. A current revision of None means the page no longer exists.
+        """
+        stale = set()
+        conn = self._conn
+        with self._lock:
+            for page_id, current in page_revisions.items():
+                rows = conn.execute(
+                    "SELECT v.claim, s.revision FROM verdict_sources s "
+                    "JOIN verdicts v ON v.claim_key = s.claim_key WHERE s.page_id = ?",
+                    (page_id,)
+                ).fetchall()
+                for row in rows:
+                    if current is None or row["revision"] != current:
+                        stale.add(row["claim"])
+        return sorted(stale)
+
+    def mark_checked(self, checked_at: Optional[float] = None, exclude: Optional[List[str]] = None) -> None:
+        """
+        Record that stored verdicts were confirmed against current revisions,
+        except for the claims in exclude. Verdicts without sources have nothing
+        to confirm and are never marked.
+        """
+        excluded = [self.claim_key(claim) for claim in (exclude or [])]
+        placeholders = ",".join("?" * len(excluded))
+        query = "UPDATE verdicts SET checked_at = ? WHERE claim_key IN (SELECT claim_key FROM verdict_sources)"
+        if excluded:
+            query += f" AND claim_key NOT IN ({placeholders})"
+        conn = self._conn
+        with self._lock, conn:
+            conn.execute(query, (checked_at or time.time(), *excluded))
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            with self._lock:
+                self._connection.close()
+        self._pid = None
+        self._connection = None
@@ -0,0 +1,107 @@
+"""
+Measure server memory as workers are added.
+
+Starts the API with 1..N workers, either through the pre-fork server or plain
+`uvicorn --workers`, waits until it answers, and reports the proportional set
+size (PSS, shared pages split between the processes that map them) of the
+whole process tree. The marginal cost of each added worker is the figure to
+compare between the two modes. Both modes load the --preload models (plain
+uvicorn through the PRELOAD_MODELS startup hook). Linux only, since it reads /proc.
+
+    python benchmarks/bench_workers.py --max-workers 4 --preload minilm
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _children(pid: int) -> List[int]:
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return pids
+
+def _process_tree(pid: int) -> List[int]:
+    tree = [pid]
+    for child in _children(pid):
+        tree.extend(_process_tree(child))
+    return tree
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    usage = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            key = parts[0].rstrip(":")
+            if key in usage:
+                usage[key] = int(parts[1])
+    return usage
+
+def _wait_ready(url: str, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2)
+            return
+        except Exception:
+            time.sleep(1)
+    raise TimeoutError(f"Server did not answer at {url} within {timeout}s")
+
+def measure(mode: str, workers: int, port: int, preload: str, settle: float) -> Dict[str, float]:
+    if mode == "prefork":
+        cmd = [sys.executable, "-m", "backend.server", "--port", str(port),
+               "--workers", str(workers), "--preload", preload, "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    env = dict(os.environ, VERDICT_REFRESH_INTERVAL="0", PRELOAD_MODELS=preload)
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, start_new_session=True)
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}/", timeout=300)
+        # Let every worker finish starting, not just the first to answer
+        time.sleep(settle)
+        pids = _process_tree(proc.pid)
+        totals = {"Rss": 0, "Pss": 0, "Private": 0}
+        for pid in pids:
+            usage = _memory_kb(pid)
+            totals["Rss"] += usage["Rss"]
+            totals["Pss"] += usage["Pss"]
+            totals["Private"] += usage["Private_Clean"] + usage["Private_Dirty"]
+        return {"processes": len(pids), **{k: v / 1024 for k, v in totals.items()}}
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=60)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--modes", default="prefork,uvicorn")
+    parser.add_argument("--preload", default="",
+                        help="models to load in both modes: before forking for the pre-fork server, "
+                             "at worker startup (PRELOAD_MODELS) for uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'workers':>7} {'procs':>5} {'RSS MB':>9} {'PSS MB':>9} {'private MB':>10} {'+PSS/worker':>11}")
+    for mode in args.modes.split(","):
+        previous = None
+        for workers in range(1, args.max_workers + 1):
+            result = measure(mode, workers, args.port, args.preload, args.settle)
+            marginal = result["Pss"] - previous if previous is not None else float("nan")
+            previous = result["Pss"]
+            print(f"{mode:<8} {workers:>7} {result['processes']:>5} {result['Rss']:>9.1f} "
+                  f"{result['Pss']:>9.1f} {result['Private']:>10.1f} {marginal:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Record and replay HTTP interactions (Ollama, Wikipedia) made through `requests`.
+
+In record mode every request goes to the live service and the response is
+saved; in replay mode responses are served from the cassette file and nothing
+touches the network, so benchmark runs are deterministic and offline.
+Interactions are matched on method, URL (including query string) and a hash
+of the request body, so a changed prompt is a cassette miss, not a stale hit.
+"""
+import datetime
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that was never recorded."""
+
+class Cassette:
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._played: Dict[str, int] = {}
+        self._original_send = None
+        self.reset_stats()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.interactions = json.load(f)
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        return f"{request.method} {request.url} {hashlib.sha256(body).hexdigest()[:16]}"
+
+    def reset_stats(self) -> None:
+        """
+        Clear the counters of served interactions: upstream latency and LLM tokens.
+        """
+        self.stats = {"requests": 0, "misses": 0, "upstream_seconds": 0.0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+
+    def rewind(self) -> None:
+        """
+        Start replaying repeated requests from their first recording again.
+        """
+        self._played = {}
+
+    def _account(self, entry: Dict[str, Any]) -> None:
+        self.stats["requests"] += 1
+        self.stats["upstream_seconds"] += entry["elapsed"]
+        if "/api/generate" in entry["url"]:
+            try:
+                data = json.loads(entry["content"])
+                self.stats["prompt_tokens"] += data.get("prompt_eval_count", 0)
+                self.stats["completion_tokens"] += data.get("eval_count", 0)
+            except ValueError:
+                pass
+
+    def _send(self, session: requests.Session, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = self.key(request)
+        if self.mode == "record":
+            response = self._original_send(session, request, **kwargs)
+            entry = {
+                "method": request.method,
+                "url": request.url,
+                "status": response.status_code,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                "content": response.content.decode("utf-8", errors="replace"),
+                "elapsed": response.elapsed.total_seconds()
+            }
+            self.interactions.setdefault(key, []).append(entry)
+            self._account(entry)
+            return response
+
+        recorded = self.interactions.get(key)
+        if not recorded:
+            self.stats["misses"] += 1
+            raise CassetteMiss(f"No recorded response for {request.method} {request.url}")
+        # Identical requests replay their recordings in order, then repeat the last one
+        index = self._played.get(key, 0)
+        self._played[key] = index + 1
+        entry = recorded[min(index, len(recorded) - 1)]
+        self._account(entry)
+        return self._build_response(request, entry)
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = entry["url"]
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=entry["elapsed"])
+        return response
+
+    def __enter__(self) -> "Cassette":
+        cassette = self
+        self._original_send = requests.Session.send
+
+        def send(session, request, **kwargs):
+            return cassette._send(session, request, **kwargs)
+
+        requests.Session.send = send
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        requests.Session.send = self._original_send
+        if self.mode == "record":
+            self.save()
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.interactions, f, indent=1, sort_keys=True)
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List
+
+def predicted_label(verification: Dict[str, Any]) -> bool:
+    """
+    Map a verdict to true/false. Verdict text wins ("Mostly false" is false,
+    "Partially true" is true); otherwise fall back to the credibility score.
+    """
+    verdict = str(verification.get("verdict", "")).lower()
+    if "false" in verdict:
+        return False
+    if "true" in verdict:
+        return True
+    return verification.get("credibility_score", 0) >= 50
+
+def brier_score(probabilities: List[float], labels: List[bool]) -> float:
+    if not labels:
+        return 0.0
+    return sum((p - float(y)) ** 2 for p, y in zip(probabilities, labels)) / len(labels)
+
+def expected_calibration_error(probabilities: List[float], labels: List[bool], bins: int = 5) -> float:
+    """
+    Average gap between predicted probability and observed frequency, weighted by bin size.
+    """
+    if not labels:
+        return 0.0
+    total = 0.0
+    for b in range(bins):
+        low, high = b / bins, (b + 1) / bins
+        members = [(p, y) for p, y in zip(probabilities, labels)
+                   if low <= p < high or (b == bins - 1 and p == 1.0)]
+        if not members:
+            continue
+        confidence = sum(p for p, _ in members) / len(members)
+        frequency = sum(float(y) for _, y in members) / len(members)
+        total += len(members) / len(labels) * abs(confidence - frequency)
+    return total
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate per-claim results (label, verification, tokens, latency) for one configuration.
+    """
+    answered = [r for r in results if not r["error"]]
+    labels = [r["label"] for r in answered]
+    probabilities = [r["verification"].get("credibility_score", 0) / 100 for r in answered]
+    correct = sum(1 for r in answered if predicted_label(r["verification"]) == r["label"])
+    latencies = [r["latency"] for r in results]
+    return {
+        "claims": len(results),
+        "errors": len(results) - len(answered),
+        # Errors count as wrong answers so a config cannot look better by failing
+        "accuracy": correct / len(results) if results else 0.0,
+        "brier": brier_score(probabilities, labels),
+        "ece": expected_calibration_error(probabilities, labels),
+        "prompt_tokens": sum(r["prompt_tokens"] for r in results),
+        "completion_tokens": sum(r["completion_tokens"] for r in results),
+        "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "latency_p95": percentile(latencies, 95)
+    }
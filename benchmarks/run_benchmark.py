@@ -0,0 +1,96 @@
+"""
+Accuracy-vs-latency benchmark for claim verification.
+
+Runs the labelled claims in benchmarks/claims.jsonl through ClaimVerifier under
+each pipeline configuration and reports accuracy, calibration of
+credibility_score (Brier score and expected calibration error), LLM tokens and
+latency. Ollama and Wikipedia responses come from a cassette:
+
+    # once, with Ollama and network available
+    python -m benchmarks.run_benchmark --record
+    # afterwards, offline and deterministic
+    python -m benchmarks.run_benchmark --configs full_context,budget_300
+
+In replay mode latency is local processing time plus the upstream time that
+was recorded for the replayed responses. A configuration whose prompts were
+never recorded shows up as errors (cassette misses), never as silent hits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List
+from backend.claim_verifier import ClaimVerifier
+from benchmarks.cassette import Cassette
+from benchmarks.metrics import summarize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CONFIGS: Dict[str, Dict[str, Any]] = {
+    "full_context": {"context_budget": 1_000_000, "model": "llama3.2"},
+    "budget_300": {"context_budget": 300, "model": "llama3.2"},
+    "budget_150": {"context_budget": 150, "model": "llama3.2"},
+}
+
+def load_claims(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+async def run_config(name: str, config: Dict[str, Any], claims: List[Dict[str, Any]], cassette: Cassette) -> Dict[str, Any]:
+    # No verdict store: every claim must be verified from scratch, and stored
+    # verdicts are keyed on the claim alone, so they would leak across configs
+    verifier = ClaimVerifier(store=None, context_budget=config["context_budget"], model=config["model"])
+    cassette.rewind()
+    results = []
+    for item in claims:
+        cassette.reset_stats()
+        started = time.perf_counter()
+        verification = await verifier.verify_claim(item["claim"])
+        elapsed = time.perf_counter() - started
+        if cassette.mode == "replay":
+            elapsed += cassette.stats["upstream_seconds"]
+        results.append({
+            "id": item["id"],
+            "label": item["label"],
+            "verification": verification,
+            "error": str(verification.get("explanation", "")).startswith("Error during fact-checking"),
+            "prompt_tokens": cassette.stats["prompt_tokens"],
+            "completion_tokens": cassette.stats["completion_tokens"],
+            "latency": elapsed
+        })
+    return {"config": name, **config, **summarize(results), "results": results}
+
+def print_report(reports: List[Dict[str, Any]]) -> None:
+    print(f"{'config':<14} {'acc':>6} {'brier':>6} {'ece':>6} {'errors':>6} "
+          f"{'prompt tok':>10} {'compl tok':>9} {'mean s':>7} {'p95 s':>7}")
+    for r in reports:
+        print(f"{r['config']:<14} {r['accuracy']:>6.3f} {r['brier']:>6.3f} {r['ece']:>6.3f} {r['errors']:>6} "
+              f"{r['prompt_tokens']:>10} {r['completion_tokens']:>9} {r['latency_mean']:>7.2f} {r['latency_p95']:>7.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", default=os.path.join(HERE, "claims.jsonl"))
+    parser.add_argument("--cassette", default=os.path.join(HERE, "cassettes", "verification.json"))
+    parser.add_argument("--configs", default=",".join(CONFIGS))
+    parser.add_argument("--record", action="store_true", help="call live services and record responses")
+    parser.add_argument("--output", help="write the full report, including per-claim results, as JSON")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.configs.split(",") if name not in CONFIGS]
+    if unknown:
+        parser.error(f"Unknown configs: {unknown}; available: {list(CONFIGS)}")
+
+    claims = load_claims(args.claims)
+    reports = []
+    with Cassette(args.cassette, mode="record" if args.record else "replay") as cassette:
+        for name in args.configs.split(","):
+            reports.append(asyncio.run(run_config(name, CONFIGS[name], claims, cassette)))
+
+    print_report(reports)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import datetime
+import os
+import tempfile
+import requests
+from benchmarks.cassette import Cassette, CassetteMiss
+
+class FakeServer:
+    """
+    Stands in for Session.send: answers each request with a numbered JSON body.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, session, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = f'{{"response": "call {self.calls}", "prompt_eval_count": 7, "eval_count": 3}}'.encode()
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=0.25)
+        return response
+
+URL = "http://localhost:11434/api/generate"
+
+def generate(prompt):
+    return requests.Session().post(URL, json={"prompt": prompt}).json()["response"]
+
+def test_record_and_replay():
+    server = FakeServer()
+    original_send = requests.Session.send
+    requests.Session.send = server.send
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cassette.json")
+            with Cassette(path, mode="record") as cassette:
+                assert generate("Is a banana a berry?") == "call 1"
+                assert generate("Is a banana a berry?") == "call 2"
+                assert generate("Is Pluto a planet?") == "call 3"
+                assert cassette.stats["prompt_tokens"] == 21
+            assert server.calls == 3
+            # Leaving the cassette restores whatever send was patched in before
+            assert requests.Session.send == server.send
+
+            with Cassette(path, mode="replay") as cassette:
+                # Matching requests replay without reaching the server
+                assert generate("Is Pluto a planet?") == "call 3"
+                # Repeated requests replay in recording order, then repeat the last one
+                assert generate("Is a banana a berry?") == "call 1"
+                assert generate("Is a banana a berry?") == "call 2"
+                assert generate("Is a banana a berry?") == "call 2"
+                cassette.rewind()
+                assert generate("Is a banana a berry?") == "call 1"
+                assert cassette.stats["upstream_seconds"] == 1.25
+                assert cassette.stats["completion_tokens"] == 15
+
+                # A changed body is a miss, never a stale hit
+                try:
+                    generate("Is a banana a vegetable?")
+                except CassetteMiss:
+                    pass
+                else:
+                    raise AssertionError("Changed request body was served from the cassette")
+                assert cassette.stats["misses"] == 1
+            assert server.calls == 3
+    finally:
+        requests.Session.send = original_send
+
+if __name__ == "__main__":
+    test_record_and_replay()
+    print("Cassette tests passed")
@@ -0,0 +1,33 @@
+from benchmarks.metrics import brier_score, expected_calibration_error, predicted_label, summarize
+
+def test_predicted_label():
+    assert predicted_label({"verdict": "True", "credibility_score": 100}) is True
+    assert predicted_label({"verdict": "Mostly false", "credibility_score": 25}) is False
+    assert predicted_label({"verdict": "Partially true", "credibility_score": 50}) is True
+    assert predicted_label({"verdict": "Unverifiable", "credibility_score": 75}) is True
+
+def test_calibration():
+    assert brier_score([1.0, 0.0], [True, False]) == 0.0
+    assert brier_score([0.0, 1.0], [True, False]) == 1.0
+    assert expected_calibration_error([1.0, 0.0], [True, False]) == 0.0
+    assert abs(expected_calibration_error([0.9, 0.9], [True, False]) - 0.4) < 1e-9
+
+def test_summarize_counts_errors_as_wrong():
+    results = [
+        {"label": True, "verification": {"verdict": "True", "credibility_score": 100}, "error": False,
+         "prompt_tokens": 300, "completion_tokens": 40, "latency": 2.0},
+        {"label": False, "verification": {"verdict": "False", "credibility_score": 0}, "error": True,
+         "prompt_tokens": 0, "completion_tokens": 0, "latency": 0.5},
+    ]
+    summary = summarize(results)
+    assert summary["accuracy"] == 0.5
+    assert summary["errors"] == 1
+    assert summary["brier"] == 0.0
+    assert summary["prompt_tokens"] == 300
+    assert summary["latency_mean"] == 1.25
+
+if __name__ == "__main__":
+    test_predicted_label()
+    test_calibration()
+    test_summarize_counts_errors_as_wrong()
+    print("Benchmark metrics tests passed")